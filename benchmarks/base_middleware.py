@@ -0,0 +1,117 @@
+"""
+Measure the per-request cost of stacking `BaseHTTPMiddleware` layers, with and
+without `passthrough_body=True`, against the equivalent `HookMiddleware` and
+pure ASGI middleware.
+Run with `python benchmarks/base_middleware.py`.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+import typing
+
+import anyio
+
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.middleware.hooks import HookMiddleware
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUESTS = 2_000
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await PlainTextResponse("Hello, world!")(scope, receive, send)
+
+
+async def add_header(request: Request, call_next: RequestResponseEndpoint) -> Response:
+    response = await call_next(request)
+    response.headers["X-Custom"] = "Example"
+    return response
+
+
+class HeaderHookMiddleware(HookMiddleware):
+    async def on_response_start(self, conn: HTTPConnection, message: Message) -> None:
+        MutableHeaders(scope=message)["X-Custom"] = "Example"
+
+
+class PureASGIMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message["headers"], (b"x-custom", b"Example")]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def build_app(kind: str, layers: int) -> ASGIApp:
+    app: ASGIApp = endpoint
+    for _ in range(layers):
+        if kind == "pure-asgi":
+            app = PureASGIMiddleware(app)
+        elif kind == "hooks":
+            app = HeaderHookMiddleware(app)
+        else:
+            app = BaseHTTPMiddleware(
+                app, dispatch=add_header, passthrough_body=kind == "passthrough"
+            )
+    return app
+
+
+def make_receive() -> Receive:
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> Message:
+        if messages:
+            return messages.pop()
+        await anyio.sleep_forever()
+        raise AssertionError("unreachable")
+
+    return receive
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def measure(app: ASGIApp) -> list[float]:
+    timings = []
+    for _ in range(REQUESTS):
+        scope: Scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+        }
+        receive = make_receive()
+        start = time.perf_counter()
+        await app(scope, receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    print(f"{'middleware':<12} {'layers':>6} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for layers in (1, 4, 8):
+        for kind in ("base", "passthrough", "hooks", "pure-asgi"):
+            app = build_app(kind, layers)
+            timings = sorted(anyio.run(typing.cast(typing.Any, measure), app))
+            p50 = statistics.median(timings) * 1e6
+            p99 = timings[int(len(timings) * 0.99)] * 1e6
+            print(f"{kind:<12} {layers:>6} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Time reading the session cookie from large ``Cookie`` headers, by parsing the
+whole header with `cookie_parser` and by looking up the one cookie with
+`find_cookie`. Run with `python benchmarks/cookies.py`.
+"""
+from __future__ import annotations
+
+import random
+import string
+import timeit
+
+from starlette.requests import cookie_parser, find_cookie
+
+
+def build_cookie_header(size: int, seed: int = 0) -> str:
+    """
+    Return a header of roughly `size` bytes, made of analytics and consent
+    style third-party cookies, with the session cookie placed at random.
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    cookies = []
+    while sum(len(cookie) + 2 for cookie in cookies) < size:
+        name = rng.choice(["_ga", "_gid", "_fbp", "_hj", "ajs", "OptanonConsent"])
+        value = "".join(rng.choices(alphabet, k=rng.randint(10, 120)))
+        if rng.random() < 0.1:
+            value = f'"{value}"'
+        cookies.append(f"{name}_{len(cookies)}={value}")
+    cookies.insert(rng.randrange(len(cookies)), "session=eyJ1c2VyIjogMTIzfQ==.abc")
+    return "; ".join(cookies)
+
+
+def main() -> None:
+    number = 5_000
+    print(f"{'header bytes':>12} {'cookie_parser (us)':>20} {'find_cookie (us)':>18}")
+    for size in (500, 3_000, 6_000):
+        header = build_cookie_header(size)
+        assert cookie_parser(header)["session"] == find_cookie(header, "session")
+        parse = timeit.timeit(lambda: cookie_parser(header)["session"], number=number)
+        find = timeit.timeit(lambda: find_cookie(header, "session"), number=number)
+        print(
+            f"{len(header):>12} {parse / number * 1e6:>20.2f}"
+            f" {find / number * 1e6:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Time `Headers` and `MutableHeaders` lookups and mutations for requests with 5,
+40 and 200 headers. "cold" operations run against a new instance, while the
+others reuse the same instance, as middleware and endpoints sharing the request
+headers do. "shared" instances wrap a list given as `raw`, as request headers
+wrap the ASGI scope's list, so their lookups scan the list. The others own
+their list and look keys up in an index. Run with
+`python benchmarks/headers.py`.
+"""
+from __future__ import annotations
+
+import timeit
+import typing
+
+from starlette.datastructures import Headers
+
+
+def build_raw(count: int) -> list[tuple[bytes, bytes]]:
+    raw = [(b"host", b"example.org")]
+    raw += [(f"x-header-{i}".encode(), b"value") for i in range(count - 2)]
+    raw.append((b"authorization", b"Bearer token"))
+    return raw
+
+
+def operations(
+    raw: list[tuple[bytes, bytes]],
+) -> dict[str, typing.Callable[[], typing.Any]]:
+    shared = Headers(raw=raw)
+    headers = shared.mutablecopy()
+    mutable = shared.mutablecopy()
+
+    def set_and_delete() -> None:
+        mutable["x-request-id"] = "abc"
+        del mutable["x-request-id"]
+
+    return {
+        "get (cold)": lambda: Headers(raw=raw)["authorization"],
+        "get (shared)": lambda: shared["authorization"],
+        "get": lambda: headers["authorization"],
+        "contains (missing)": lambda: "x-forwarded-for" in headers,
+        "getlist": lambda: headers.getlist("host"),
+        "set (existing)": lambda: mutable.__setitem__("authorization", "Bearer"),
+        "set + delete (new)": set_and_delete,
+    }
+
+
+def main() -> None:
+    counts = (5, 40, 200)
+    number = 100_000
+    print(f"{'operation':<20}" + "".join(f"{c:>10} hdrs" for c in counts))
+    results: dict[str, list[float]] = {}
+    for count in counts:
+        for name, func in operations(build_raw(count)).items():
+            seconds = timeit.timeit(func, number=number)
+            results.setdefault(name, []).append(seconds / number * 1e9)
+    for name, timings in results.items():
+        print(f"{name:<20}" + "".join(f"{t:>11.0f}ns" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
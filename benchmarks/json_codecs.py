@@ -0,0 +1,62 @@
+"""
+Compare the throughput of the JSON codecs on representative payloads, for
+rendering a `JSONResponse` and for parsing a request body. Run with
+`python benchmarks/json_codecs.py`.
+"""
+from __future__ import annotations
+
+import timeit
+import typing
+
+from starlette.json_codecs import JSONCodec, StdlibJSONCodec, get_json_codec
+
+
+def make_payloads() -> dict[str, typing.Any]:
+    record = {
+        "id": 12345,
+        "name": "Ada Lovelace",
+        "email": "ada@example.org",
+        "active": True,
+        "score": 98.25,
+        "tags": ["math", "engines", "poetry"],
+        "address": {"city": "London", "postcode": "W1", "country": "GB"},
+        "bio": "Écrivaine et mathématicienne — “the first programmer”.",
+    }
+    return {
+        "small object": {"status": "ok", "count": 3},
+        "single record": record,
+        "100 records": [dict(record, id=i) for i in range(100)],
+        "10k numbers": [i * 1.5 for i in range(10_000)],
+    }
+
+
+def codecs() -> dict[str, JSONCodec]:
+    available = {"json": StdlibJSONCodec()}
+    try:
+        available["orjson"] = get_json_codec("orjson")
+    except AssertionError:  # pragma: no cover
+        pass
+    return available
+
+
+def main() -> None:
+    payloads = make_payloads()
+    available = codecs()
+    header = "".join(
+        f"{name + ' dumps':>16}{name + ' loads':>16}" for name in available
+    )
+    print(f"{'payload':<16} {'bytes':>8}{header}   (MB/s)")
+    for name, payload in payloads.items():
+        data = StdlibJSONCodec().dumps(payload)
+        number = max(10, 2_000_000 // len(data))
+        row = f"{name:<16} {len(data):>8}"
+        for codec in available.values():
+            dumps = timeit.timeit(lambda: codec.dumps(payload), number=number)
+            loads = timeit.timeit(lambda: codec.loads(data), number=number)
+            row += f"{len(data) * number / dumps / 1e6:>16.1f}"
+            row += f"{len(data) * number / loads / 1e6:>16.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
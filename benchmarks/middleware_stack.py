@@ -0,0 +1,123 @@
+"""
+Compare a middleware stack built by nesting every layer with one built by
+`build_middleware_stack()`, which skips layers for the scope types they don't
+handle. Reports the number of coroutines awaited and the time per scope, and
+the time added by each layer of the HTTP chain.
+Run with `python benchmarks/middleware_stack.py`.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import statistics
+import sys
+import time
+import types
+import typing
+
+from starlette.middleware import Middleware, build_middleware_stack
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.errors import ServerErrorMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUESTS = 5_000
+
+MIDDLEWARE = [
+    Middleware(ServerErrorMiddleware),
+    Middleware(CORSMiddleware, allow_origins=["*"]),
+    Middleware(GZipMiddleware),
+    Middleware(TrustedHostMiddleware, allowed_hosts=["example.org"]),
+    Middleware(SessionMiddleware, secret_key="secret"),
+    Middleware(ExceptionMiddleware),
+]
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    pass
+
+
+async def receive() -> Message:
+    return {}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+def nested_stack(app: ASGIApp, middleware: list[Middleware]) -> ASGIApp:
+    for cls, args, kwargs in reversed(middleware):
+        app = cls(app, *args, **kwargs)
+    return app
+
+
+def make_scope(scope_type: str) -> Scope:
+    return {
+        "type": scope_type,
+        "scheme": "https",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"host", b"example.org")],
+    }
+
+
+def count_awaits(app: ASGIApp, scope_type: str) -> int:
+    count = 0
+
+    def profile(frame: types.FrameType, event: str, arg: typing.Any) -> None:
+        nonlocal count
+        if event == "call" and frame.f_code.co_flags & inspect.CO_COROUTINE:
+            count += 1
+
+    async def run() -> None:
+        sys.setprofile(profile)
+        try:
+            await app(make_scope(scope_type), receive, send)
+        finally:
+            sys.setprofile(None)
+
+    asyncio.run(run())
+    return count
+
+
+def median_time(app: ASGIApp, scope_type: str) -> float:
+    async def run() -> list[float]:
+        timings = []
+        for _ in range(REQUESTS):
+            scope = make_scope(scope_type)
+            start = time.perf_counter()
+            await app(scope, receive, send)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    return statistics.median(asyncio.run(run())) * 1e6
+
+
+def main() -> None:
+    print(f"{'stack':<10} {'scope':<10} {'awaits':>7} {'p50 (us)':>10}")
+    for scope_type in ("http", "websocket", "lifespan"):
+        for name, build in (
+            ("nested", nested_stack),
+            ("flattened", build_middleware_stack),
+        ):
+            app = build(endpoint, MIDDLEWARE)
+            awaits = count_awaits(app, scope_type)
+            p50 = median_time(app, scope_type)
+            print(f"{name:<10} {scope_type:<10} {awaits:>7} {p50:>10.2f}")
+
+    print()
+    print(f"{'http layer':<24} {'added p50 (us)':>15}")
+    previous = median_time(endpoint, "http")
+    for count in range(1, len(MIDDLEWARE) + 1):
+        app = build_middleware_stack(endpoint, MIDDLEWARE[-count:])
+        total = median_time(app, "http")
+        name = MIDDLEWARE[-count].cls.__name__
+        print(f"{name:<24} {total - previous:>15.2f}")
+        previous = total
+
+
+if __name__ == "__main__":
+    main()
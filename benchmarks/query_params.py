@@ -0,0 +1,49 @@
+"""
+Time reading a few keys from `QueryParams` built from query strings of
+increasing size, with the lazy lookups that are used until the parameters are
+needed in full, and with the query string parsed up front. Run with
+`python benchmarks/query_params.py`.
+"""
+from __future__ import annotations
+
+import timeit
+from urllib.parse import urlencode
+
+from starlette.datastructures import QueryParams
+
+KEYS = ("q", "page", "sort")
+
+
+def build_query_string(count: int) -> bytes:
+    params = [("q", "starlette streaming"), ("page", "3"), ("sort", "-date")]
+    params += [(f"facet{i}", f"value {i}/ünïcode") for i in range(count - len(params))]
+    return urlencode(params).encode("latin-1")
+
+
+def read_lazily(query_string: bytes) -> list[str | None]:
+    params = QueryParams(query_string)
+    return [params.get(key) for key in KEYS]
+
+
+def read_parsed(query_string: bytes) -> list[str | None]:
+    params = QueryParams(query_string)
+    len(params)  # Parses the whole query string.
+    return [params.get(key) for key in KEYS]
+
+
+def main() -> None:
+    number = 2_000
+    print(f"{'params':>8} {'bytes':>8} {'lazy (us)':>12} {'parsed (us)':>12}")
+    for count in (5, 50, 200, 1_000):
+        query_string = build_query_string(count)
+        timings = [
+            timeit.timeit(lambda: func(query_string), number=number) / number * 1e6
+            for func in (read_lazily, read_parsed)
+        ]
+        print(
+            f"{count:>8} {len(query_string):>8} {timings[0]:>12.2f} {timings[1]:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
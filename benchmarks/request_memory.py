@@ -0,0 +1,84 @@
+"""
+Measure the memory held by a `Request` for a typical GET request, once its
+URL, headers, query parameters and cookies have been read, with and without a
+query string and cookies. Run with `python benchmarks/request_memory.py`.
+"""
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+import typing
+
+from starlette.requests import Request
+from starlette.types import Scope
+
+HEADERS = [
+    (b"host", b"example.org"),
+    (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Firefox/121.0"),
+    (b"accept", b"text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"),
+    (b"accept-language", b"en-GB,en;q=0.5"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"connection", b"keep-alive"),
+]
+
+
+def make_scope(query_string: bytes, cookie: bytes | None) -> Scope:
+    headers = list(HEADERS)
+    if cookie is not None:
+        headers.append((b"cookie", cookie))
+    return {
+        "type": "http",
+        "method": "GET",
+        "scheme": "https",
+        "server": ("example.org", 443),
+        "path": "/articles/2024/hello-world",
+        "root_path": "",
+        "query_string": query_string,
+        "headers": headers,
+    }
+
+
+def handle(scope: Scope) -> Request:
+    request = Request(scope)
+    request.url.path
+    request.headers.get("accept")
+    request.query_params.get("page")
+    request.cookies.get("session")
+    return request
+
+
+def retained_bytes(func: typing.Callable[[], typing.Any], count: int) -> float:
+    """
+    Return the bytes still allocated per call after `count` calls of `func()`,
+    with their results kept alive.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    results = [func() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return (after - before) / count
+
+
+def main() -> None:
+    cases = {
+        "plain GET": (b"", None),
+        "query + cookies": (
+            b"page=2&sort=date&tag=python&tag=asgi",
+            b"session=abc123; theme=dark; consent=yes",
+        ),
+    }
+    count = 1_000
+    print(f"{'request':<18} {'bytes per request':>18} {'time per request (us)':>22}")
+    for name, (query_string, cookie) in cases.items():
+        scopes = [make_scope(query_string, cookie) for _ in range(count)]
+        remaining = iter(scopes)
+        allocated = retained_bytes(lambda: handle(next(remaining)), count)
+        scope = make_scope(query_string, cookie)
+        seconds = timeit.timeit(lambda: handle(dict(scope)), number=20_000) / 20_000
+        print(f"{name:<18} {allocated:>18.0f} {seconds * 1e6:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
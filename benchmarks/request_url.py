@@ -0,0 +1,60 @@
+"""
+Time building `request.url` and reading its components, `request.base_url`,
+and absolute `request.url_for()` calls on new requests. Run with
+`python benchmarks/request_url.py`.
+"""
+from __future__ import annotations
+
+import timeit
+import typing
+
+from starlette.requests import Request
+from starlette.routing import Route, Router
+from starlette.types import Receive, Scope, Send
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    pass  # pragma: no cover
+
+
+def make_scope(router: Router, i: int) -> Scope:
+    return {
+        "type": "http",
+        "method": "GET",
+        "scheme": "https",
+        "server": ("10.0.0.1", 8000),
+        "path": f"/articles/{i}",
+        "root_path": "",
+        "query_string": b"page=2&sort=date",
+        "headers": [(b"host", b"example.org"), (b"accept", b"*/*")],
+        "router": router,
+    }
+
+
+def main() -> None:
+    router = Router([Route("/articles/{id:int}", endpoint, name="article")])
+    scopes = [make_scope(router, i) for i in range(1_000)]
+
+    def url(request: Request) -> typing.Any:
+        return request.url.path, request.url.query
+
+    def base_url(request: Request) -> typing.Any:
+        return request.base_url
+
+    def url_for(request: Request) -> typing.Any:
+        return [request.url_for("article", id=i) for i in range(10)]
+
+    print(f"{'operation':<22} {'per request (us)':>18}")
+    for name, func in (
+        ("url.path + url.query", url),
+        ("base_url", base_url),
+        ("10 x url_for()", url_for),
+    ):
+        requests = iter([Request(scope) for scope in scopes * 10])
+        number = len(scopes) * 10
+        seconds = timeit.timeit(lambda: func(next(requests)), number=number)
+        print(f"{name:<22} {seconds / number * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure the cost of dispatching a request through a `Router` as the number of
+routes grows, for each dispatch mode. Run with `python benchmarks/routing.py`.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from starlette.routing import Mount, Route, Router
+from starlette.types import Message, Receive, Scope, Send
+
+REQUESTS = 1_000
+
+
+class Endpoint:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        pass
+
+
+async def receive() -> Message:
+    return {"type": "http.request"}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+def build_router(count: int, dispatch: str) -> Router:
+    routes = []
+    for i in range(count // 2):
+        routes.append(Route(f"/api/v1/resource{i}", Endpoint(), methods=["GET"]))
+        routes.append(Route(f"/api/v1/resource{i}/{{id:int}}", Endpoint()))
+    routes.append(Mount("/static", app=Endpoint()))
+    return Router(routes=routes, dispatch=dispatch)
+
+
+def make_scope(method: str, path: str) -> Scope:
+    return {
+        "type": "http",
+        "method": method,
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+
+
+async def measure(router: Router, method: str, path: str) -> list[float]:
+    timings = []
+    for _ in range(REQUESTS):
+        scope = make_scope(method, path)
+        start = time.perf_counter()
+        await router.app(scope, receive, send)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    print(
+        f"{'dispatch':<12} {'routes':>8} {'request':<37}"
+        f" {'p50 (us)':>10} {'p99 (us)':>10}"
+    )
+    for dispatch in ("prefix-tree", "regex-union", "linear"):
+        for count in (10, 100, 1_000, 5_000):
+            router = build_router(count, dispatch)
+            last = count // 2 - 1
+            for method, path in (
+                ("GET", f"/api/v1/resource{last}"),
+                ("GET", f"/api/v1/resource{last}/42"),
+                ("GET", "/static/css/site.css"),
+                ("GET", f"/api/v1/resource{last}/"),
+                ("GET", "/wp-admin/setup-config.php"),
+                # A partial match, answered with "405 Method Not Allowed".
+                ("POST", f"/api/v1/resource{last}"),
+            ):
+                timings = sorted(asyncio.run(measure(router, method, path)))
+                p50 = statistics.median(timings) * 1e6
+                p99 = timings[int(len(timings) * 0.99)] * 1e6
+                request = f"{method} {path}"
+                print(
+                    f"{dispatch:<12} {count:>8} {request:<37}"
+                    f" {p50:>10.2f} {p99:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the number of `send()` calls and the throughput of a `StreamingResponse`
+that sends every chunk as it is yielded with one that coalesces chunks into
+64KB messages, for generators yielding chunks of increasing size. Run with
+`python benchmarks/streaming_buffer.py`.
+"""
+from __future__ import annotations
+
+import time
+import typing
+
+import anyio
+
+from starlette.responses import StreamingResponse
+from starlette.types import Message
+
+TOTAL = 256 * 1024
+
+
+async def chunks(size: int) -> typing.AsyncIterator[bytes]:
+    chunk = b"x" * size
+    for _ in range(TOTAL // size):
+        yield chunk
+
+
+async def receive() -> Message:
+    await anyio.sleep_forever()
+    raise AssertionError()  # pragma: no cover
+
+
+async def run(size: int, buffer_size: int | None) -> tuple[int, float]:
+    sends = 0
+
+    async def send(message: Message) -> None:
+        nonlocal sends
+        sends += 1
+        # Let other tasks run, as a server writing to a transport would.
+        await anyio.sleep(0)
+
+    started = time.perf_counter()
+    response = StreamingResponse(chunks(size), buffer_size=buffer_size)
+    await response({"type": "http"}, receive, send)
+    return sends, time.perf_counter() - started
+
+
+async def main() -> None:
+    print(
+        f"{'chunk bytes':>11} {'sends':>8} {'MB/s':>9}"
+        f" {'buffered sends':>15} {'buffered MB/s':>14}"
+    )
+    for size in (1, 16, 256, 4096, 65536):
+        sends, elapsed = await run(size, None)
+        buffered_sends, buffered_elapsed = await run(size, 65536)
+        print(
+            f"{size:>11} {sends:>8} {TOTAL / elapsed / 1e6:>9.1f}"
+            f" {buffered_sends:>15} {TOTAL / buffered_elapsed / 1e6:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    anyio.run(main)
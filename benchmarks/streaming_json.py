@@ -0,0 +1,66 @@
+"""
+Compare the peak memory and time of sending a large result set as a
+`JSONResponse`, which needs every item and the whole encoded body in memory,
+and as a `StreamingJSONResponse` fed by a generator. Run with
+`python benchmarks/streaming_json.py`.
+"""
+from __future__ import annotations
+
+import time
+import tracemalloc
+import typing
+
+import anyio
+
+from starlette.responses import JSONResponse, Response, StreamingJSONResponse
+from starlette.types import Message
+
+
+def rows(count: int) -> typing.Iterator[dict[str, typing.Any]]:
+    for i in range(count):
+        yield {"id": i, "name": f"item {i}", "price": i * 0.5, "tags": ["a", "b"]}
+
+
+async def receive() -> Message:
+    await anyio.sleep_forever()
+    raise AssertionError()  # pragma: no cover
+
+
+async def run(make_response: typing.Callable[[], Response]) -> tuple[int, int, float]:
+    sends = 0
+
+    async def send(message: Message) -> None:
+        nonlocal sends
+        sends += 1
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = make_response()
+    await response({"type": "http"}, receive, send)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, sends, elapsed
+
+
+async def main() -> None:
+    print(f"{'response':<30} {'items':>8} {'peak MB':>9} {'sends':>7} {'seconds':>8}")
+    for count in (10_000, 100_000):
+        cases: dict[str, typing.Callable[[], Response]] = {
+            "JSONResponse": lambda: JSONResponse(list(rows(count))),
+            "StreamingJSONResponse": lambda: StreamingJSONResponse(
+                rows(count), batch_size=100
+            ),
+            "StreamingJSONResponse (1000)": lambda: StreamingJSONResponse(
+                rows(count), batch_size=1000
+            ),
+        }
+        for name, make_response in cases.items():
+            peak, sends, elapsed = await run(make_response)
+            print(
+                f"{name:<30} {count:>8} {peak / 1e6:>9.1f} {sends:>7} {elapsed:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    anyio.run(main)
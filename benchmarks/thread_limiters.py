@@ -0,0 +1,55 @@
+"""
+Measure how long quick sync endpoint calls wait for a worker thread while a
+backlog of slow file writes is running, with every kind of work sharing anyio's
+default thread limiter, and with the writes given their own limiter. Run with
+`python benchmarks/thread_limiters.py`.
+"""
+from __future__ import annotations
+
+import time
+
+import anyio
+
+from starlette.concurrency import ThreadLimiter
+
+
+def slow_write() -> None:
+    time.sleep(0.2)
+
+
+def endpoint() -> None:
+    pass
+
+
+async def run(file_io_threads: int | None) -> None:
+    endpoints = ThreadLimiter("endpoints")
+    file_io = ThreadLimiter("file-io", file_io_threads)
+
+    async with anyio.create_task_group() as task_group:
+        for _ in range(200):
+            task_group.start_soon(file_io.run, slow_write)
+        await anyio.sleep(0.01)
+        queue_depth = file_io.statistics().queue_depth
+        for _ in range(20):
+            task_group.start_soon(endpoints.run, endpoint)
+
+    statistics = endpoints.statistics()
+    label = "shared" if file_io_threads is None else f"file-io: {file_io_threads}"
+    print(
+        f"{label:<12} {queue_depth:>15}"
+        f" {statistics.total_wait_time / statistics.calls * 1e3:>14.1f}"
+        f" {statistics.max_wait_time * 1e3:>13.1f}"
+    )
+
+
+def main() -> None:
+    print(
+        f"{'limiters':<12} {'file-io queued':>15}"
+        f" {'avg wait (ms)':>14} {'max wait (ms)':>13}"
+    )
+    anyio.run(run, None)
+    anyio.run(run, 8)
+
+
+if __name__ == "__main__":
+    main()
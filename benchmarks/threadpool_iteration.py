@@ -0,0 +1,67 @@
+"""
+Compare the chunks per second read from a sync generator one item per thread
+round trip, with `iterate_in_threadpool`, and a batch at a time, with
+`iterate_in_threadpool_batched`, and the same for a `StreamingResponse` over a
+sync generator without and with `buffer_size`. Run with
+`python benchmarks/threadpool_iteration.py`.
+"""
+from __future__ import annotations
+
+import time
+import typing
+
+import anyio
+
+from starlette.concurrency import iterate_in_threadpool, iterate_in_threadpool_batched
+from starlette.responses import StreamingResponse
+from starlette.types import Message
+
+COUNT = 20_000
+
+
+def chunks(size: int) -> typing.Iterator[bytes]:
+    chunk = b"x" * size
+    for _ in range(COUNT):
+        yield chunk
+
+
+async def receive() -> Message:
+    await anyio.sleep_forever()
+    raise AssertionError()  # pragma: no cover
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def iterate(iterator: typing.AsyncIterator[bytes]) -> None:
+    async for _ in iterator:
+        pass
+
+
+async def main() -> None:
+    cases: dict[str, typing.Callable[[int], typing.Awaitable[None]]] = {
+        "iterate_in_threadpool": lambda size: iterate(
+            iterate_in_threadpool(chunks(size))
+        ),
+        "iterate_in_threadpool_batched": lambda size: iterate(
+            iterate_in_threadpool_batched(chunks(size), max_items=64)
+        ),
+        "StreamingResponse": lambda size: StreamingResponse(chunks(size))(
+            {"type": "http"}, receive, send
+        ),
+        "StreamingResponse (64KB)": lambda size: StreamingResponse(
+            chunks(size), buffer_size=65536
+        )({"type": "http"}, receive, send),
+    }
+    print(f"{'iteration':<30} {'chunk bytes':>11} {'chunks/s':>10}")
+    for size in (16, 1024):
+        for name, run in cases.items():
+            started = time.perf_counter()
+            await run(size)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<30} {size:>11} {COUNT / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    anyio.run(main)
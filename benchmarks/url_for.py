@@ -0,0 +1,80 @@
+"""
+Measure the cost of rendering a template that makes 200 `url_for` calls, with
+a realistically sized route table, and of building a single route's URL path.
+Run with `python benchmarks/url_for.py`.
+"""
+from __future__ import annotations
+
+import timeit
+
+import jinja2
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+from starlette.templating import Jinja2Templates
+
+TEMPLATE = """
+{% for i in range(50) %}
+<a href="{{ url_for('homepage') }}">Home</a>
+<a href="{{ url_for('api:item', resource=last, id=i) }}">Item</a>
+<a href="{{ url_for('api:' ~ last) }}">List</a>
+<a href="{{ url_for('static', path='/css/site.css') }}">Style</a>
+{% endfor %}
+"""
+
+
+def endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("")
+
+
+def build_app(count: int) -> Starlette:
+    api_routes = [
+        Route(f"/resource{i}", endpoint, name=f"resource{i}") for i in range(count)
+    ]
+    api_routes.append(Route("/{resource}/{id:int}", endpoint, name="item"))
+    return Starlette(
+        routes=[
+            Route("/", endpoint, name="homepage"),
+            Mount("/api", routes=api_routes, name="api"),
+            Mount("/static", app=endpoint, name="static"),
+        ]
+    )
+
+
+def main() -> None:
+    env = jinja2.Environment(loader=jinja2.DictLoader({"page.html": TEMPLATE}))
+    templates = Jinja2Templates(env=env)
+    template = templates.get_template("page.html")
+
+    print(f"{'routes':>8} {'per render (ms)':>16}")
+    for count in (10, 100, 1_000):
+        app = build_app(count)
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"example.org")],
+            "router": app.router,
+        }
+        request = Request(scope)
+        number = 20
+        seconds = timeit.timeit(
+            lambda: template.render(request=request, last=f"resource{count - 1}"),
+            number=number,
+        )
+        print(f"{count:>8} {seconds / number * 1000:>16.2f}")
+
+    route = Route("/orgs/{org}/items/{id:int}/rev/{rev:int}", endpoint, name="item")
+    number = 100_000
+    seconds = timeit.timeit(
+        lambda: route.url_path_for("item", org="encode", id=42, rev=3), number=number
+    )
+    print(f"Route.url_path_for with 3 params: {seconds / number * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import typing
 
 from starlette._utils import is_async_callable
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import get_thread_limiter
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from starlette.types import (
@@ -74,7 +74,9 @@ def wrap_app_handling_exceptions(app: ASGIApp, conn: Request | WebSocket) -> ASG
                 if is_async_callable(handler):
                     response = await handler(conn, exc)
                 else:
-                    response = await run_in_threadpool(handler, conn, exc)
+                    response = await get_thread_limiter("endpoints").run(
+                        handler, conn, exc
+                    )
                 await response(scope, receive, sender)
             elif scope["type"] == "websocket":
                 handler = typing.cast(WebSocketExceptionHandler, handler)
@@ -82,6 +84,6 @@ def wrap_app_handling_exceptions(app: ASGIApp, conn: Request | WebSocket) -> ASG
                 if is_async_callable(handler):
                     await handler(conn, exc)
                 else:
-                    await run_in_threadpool(handler, conn, exc)
+                    await get_thread_limiter("endpoints").run(handler, conn, exc)
 
     return wrapped_app
@@ -7,6 +7,7 @@ import sys
 import typing
 from contextlib import contextmanager
 
+from starlette.datastructures import Headers
 from starlette.types import Scope
 
 if sys.version_info >= (3, 10):  # pragma: no cover
@@ -93,6 +94,17 @@ def collapse_excgroups() -> typing.Generator[None, None, None]:
         raise exc
 
 
+def get_headers(scope: Scope) -> Headers:
+    """
+    Return the request headers, parsed once per request and stored in the
+    scope. They are parsed again if `scope["headers"]` is replaced.
+    """
+    headers: Headers | None = scope.get("starlette.headers")
+    if headers is None or headers._list is not scope["headers"]:
+        headers = scope["starlette.headers"] = Headers(scope=scope)
+    return headers
+
+
 def get_route_path(scope: Scope) -> str:
     root_path = scope.get("root_path", "")
     route_path = re.sub(r"^" + root_path, "", scope["path"])
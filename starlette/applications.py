@@ -9,11 +9,23 @@ if sys.version_info >= (3, 10):  # pragma: no cover
 else:  # pragma: no cover
     from typing_extensions import ParamSpec
 
+from starlette.concurrency import ThreadLimiter, app_thread_limiters
 from starlette.datastructures import State, URLPath
-from starlette.middleware import Middleware, _MiddlewareClass
+from starlette.json_codecs import JSONCodec, app_json_codec, get_json_codec
+from starlette.middleware import (
+    Middleware,
+    _MiddlewareClass,
+    _ScopeTypeDispatch,
+    build_middleware_stack,
+)
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.errors import ServerErrorMiddleware
 from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.middleware.timing import (
+    MiddlewareTimingCollector,
+    MiddlewareTimingHistogram,
+    TimedLayer,
+)
 from starlette.requests import Request
 from starlette.responses import Response
 from starlette.routing import BaseRoute, Router
@@ -52,6 +64,23 @@ class Starlette:
     * **lifespan** - A lifespan context function, which can be used to perform
     startup and shutdown tasks. This is a newer style that replaces the
     `on_startup` and `on_shutdown` handlers. Use one or the other, not both.
+    * **freeze_routes** - Boolean indicating if the route table should be
+    validated and compiled on application startup, after which routes can no
+    longer be added or removed. Startup fails if any route is shadowed by an
+    earlier route, or if route names are ambiguous.
+    * **instrument_middleware** - Either `True`, or a `MiddlewareTimingCollector`
+    instance, to record the time spent in each middleware layer, including route
+    middleware. With `True`, timings are collected in memory by a
+    `MiddlewareTimingHistogram`. The collector is available as
+    `app.state.middleware_timings`.
+    * **json_codec** - A `JSONCodec`, or the name of a registered codec such as
+    `"orjson"`, used by `JSONResponse` and `Request.json()` while handling
+    requests to this application. Defaults to the standard library `json` module.
+    * **thread_limiters** - A mapping of thread limiter names, such as
+    `"endpoints"`, `"file-io"` and `"background"`, to the number of worker threads
+    that work of that kind may use at once, while handling requests to this
+    application. Work of kinds that aren't configured uses the limiters shared
+    by the process.
     """
 
     def __init__(
@@ -63,6 +92,10 @@ class Starlette:
         on_startup: typing.Sequence[typing.Callable[[], typing.Any]] | None = None,
         on_shutdown: typing.Sequence[typing.Callable[[], typing.Any]] | None = None,
         lifespan: Lifespan[AppType] | None = None,
+        freeze_routes: bool = False,
+        instrument_middleware: bool | MiddlewareTimingCollector = False,
+        json_codec: str | JSONCodec | None = None,
+        thread_limiters: typing.Mapping[str, int] | None = None,
     ) -> None:
         # The lifespan context function is a newer style that replaces
         # on_startup / on_shutdown handlers. Use one or the other, not both.
@@ -73,13 +106,29 @@ class Starlette:
         self.debug = debug
         self.state = State()
         self.router = Router(
-            routes, on_startup=on_startup, on_shutdown=on_shutdown, lifespan=lifespan
+            routes,
+            on_startup=on_startup,
+            on_shutdown=on_shutdown,
+            lifespan=lifespan,
+            freeze_routes=freeze_routes,
         )
         self.exception_handlers = (
             {} if exception_handlers is None else dict(exception_handlers)
         )
         self.user_middleware = [] if middleware is None else list(middleware)
         self.middleware_stack: typing.Optional[ASGIApp] = None
+        self.middleware_timings: MiddlewareTimingCollector | None = None
+        if isinstance(instrument_middleware, MiddlewareTimingCollector):
+            self.middleware_timings = instrument_middleware
+        elif instrument_middleware:
+            self.middleware_timings = MiddlewareTimingHistogram()
+        if self.middleware_timings is not None:
+            self.state.middleware_timings = self.middleware_timings
+        self.json_codec = None if json_codec is None else get_json_codec(json_codec)
+        self.thread_limiters = {
+            name: ThreadLimiter(name, total_tokens)
+            for name, total_tokens in (thread_limiters or {}).items()
+        }
 
     def build_middleware_stack(self) -> ASGIApp:
         debug = self.debug
@@ -104,10 +153,40 @@ class Starlette:
             ]
         )
 
-        app = self.router
-        for cls, args, kwargs in reversed(middleware):
-            app = cls(app=app, *args, **kwargs)
-        return app
+        collector = self.middleware_timings
+        if collector is None:
+            return build_middleware_stack(self.router, middleware)
+
+        def instrument(app: ASGIApp, name: str) -> ASGIApp:
+            return TimedLayer(app, name, collector)
+
+        self.router._instrument(instrument)
+        return build_middleware_stack(
+            instrument(self.router, "Router"),
+            middleware,
+            instrument=lambda layer: instrument(layer, type(layer).__name__),
+        )
+
+    def middleware_chain(self, scope_type: str) -> list[ASGIApp]:
+        """
+        Return the middleware that a scope of the given type passes through,
+        from the outermost inwards. Middleware that declare the scope types
+        they handle are skipped for any other type.
+        """
+        if self.middleware_stack is None:
+            self.middleware_stack = self.build_middleware_stack()
+        chain = []
+        app: typing.Any = self.middleware_stack
+        while app is not self.router and app is not None:
+            if isinstance(app, _ScopeTypeDispatch):
+                app = app.apps.get(scope_type, app.default)
+                continue
+            if isinstance(app, TimedLayer):
+                app = app.app
+                continue
+            chain.append(app)
+            app = getattr(app, "app", None)
+        return chain
 
     @property
     def routes(self) -> list[BaseRoute]:
@@ -120,7 +199,22 @@ class Starlette:
         scope["app"] = self
         if self.middleware_stack is None:
             self.middleware_stack = self.build_middleware_stack()
-        await self.middleware_stack(scope, receive, send)
+        if self.json_codec is None and not self.thread_limiters:
+            await self.middleware_stack(scope, receive, send)
+            return
+        codec_token = None
+        if self.json_codec is not None:
+            codec_token = app_json_codec.set(self.json_codec)
+        limiters_token = None
+        if self.thread_limiters:
+            limiters_token = app_thread_limiters.set(self.thread_limiters)
+        try:
+            await self.middleware_stack(scope, receive, send)
+        finally:
+            if limiters_token is not None:
+                app_thread_limiters.reset(limiters_token)
+            if codec_token is not None:
+                app_json_codec.reset(codec_token)
 
     def on_event(self, event_type: str) -> typing.Callable:  # type: ignore[type-arg]
         return self.router.on_event(event_type)  # pragma: nocover
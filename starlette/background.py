@@ -9,7 +9,7 @@ else:  # pragma: no cover
     from typing_extensions import ParamSpec
 
 from starlette._utils import is_async_callable
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import get_thread_limiter
 
 P = ParamSpec("P")
 
@@ -27,7 +27,9 @@ class BackgroundTask:
         if self.is_async:
             await self.func(*self.args, **self.kwargs)
         else:
-            await run_in_threadpool(self.func, *self.args, **self.kwargs)
+            await get_thread_limiter("background").run(
+                self.func, *self.args, **self.kwargs
+            )
 
 
 class BackgroundTasks(BackgroundTask):
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import contextvars
 import functools
 import sys
+import threading
+import time
 import typing
 import warnings
 
+import anyio.lowlevel
 import anyio.to_thread
 
 if sys.version_info >= (3, 10):  # pragma: no cover
@@ -42,6 +46,168 @@ async def run_in_threadpool(
     return await anyio.to_thread.run_sync(func, *args)
 
 
+class ThreadLimiterStatistics(typing.NamedTuple):
+    total_tokens: float
+    # Worker threads running the limiter's work.
+    active_threads: int
+    # Calls waiting for a worker thread.
+    queue_depth: int
+    # Calls that have started running, and how long they waited to start.
+    calls: int
+    total_wait_time: float
+    max_wait_time: float
+
+
+class _ThreadLimiterState:
+    # The work of one `ThreadLimiter` in one event loop. The counts are updated
+    # from worker threads as calls start, so they're changed under `lock`.
+    def __init__(self) -> None:
+        self.capacity_limiter: anyio.CapacityLimiter | None = None
+        self.lock = threading.Lock()
+        self.active_threads = 0
+        self.queue_depth = 0
+        self.calls = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+
+# The state of each `ThreadLimiter` in the current event loop.
+_thread_limiter_states: anyio.lowlevel.RunVar[
+    dict[ThreadLimiter, _ThreadLimiterState]
+] = anyio.lowlevel.RunVar("starlette.thread_limiter_states")
+
+
+class ThreadLimiter:
+    """
+    Limits the number of worker threads used by one kind of work, so that a
+    backlog of one kind of work doesn't hold up the others. With `total_tokens`
+    left as `None`, the work shares anyio's default thread limiter.
+    """
+
+    def __init__(self, name: str, total_tokens: int | None = None) -> None:
+        self.name = name
+        self.total_tokens = total_tokens
+
+    def _state(self) -> _ThreadLimiterState:
+        states = _thread_limiter_states.get(None)
+        if states is None:
+            states = {}
+            _thread_limiter_states.set(states)
+        state = states.get(self)
+        if state is None:
+            state = states[self] = _ThreadLimiterState()
+        return state
+
+    @property
+    def capacity_limiter(self) -> anyio.CapacityLimiter:
+        if self.total_tokens is None:
+            return anyio.to_thread.current_default_thread_limiter()
+        state = self._state()
+        limiter = state.capacity_limiter
+        if limiter is None:
+            limiter = state.capacity_limiter = anyio.CapacityLimiter(self.total_tokens)
+        elif limiter.total_tokens != self.total_tokens:
+            limiter.total_tokens = self.total_tokens
+        return limiter
+
+    async def run(
+        self, func: typing.Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """
+        Like `run_in_threadpool`, but within this limit.
+        """
+        call = functools.partial(func, *args, **kwargs)
+        state = self._state()
+        queued = time.monotonic()
+        started = False
+
+        def run_call() -> T:
+            nonlocal started
+            wait_time = time.monotonic() - queued
+            with state.lock:
+                state.queue_depth -= 1
+                state.active_threads += 1
+                state.calls += 1
+                state.total_wait_time += wait_time
+                state.max_wait_time = max(state.max_wait_time, wait_time)
+            started = True
+            return call()
+
+        with state.lock:
+            state.queue_depth += 1
+        try:
+            return await anyio.to_thread.run_sync(
+                run_call, limiter=self.capacity_limiter
+            )
+        finally:
+            with state.lock:
+                if started:
+                    state.active_threads -= 1
+                else:
+                    state.queue_depth -= 1
+
+    def statistics(self) -> ThreadLimiterStatistics:
+        """
+        Return how saturated the limiter is in the current event loop, and how
+        long calls have waited for a worker thread. Only calls made through this
+        limiter are counted, even if it shares anyio's default thread limiter.
+        """
+        state = self._state()
+        return ThreadLimiterStatistics(
+            total_tokens=self.capacity_limiter.total_tokens,
+            active_threads=state.active_threads,
+            queue_depth=state.queue_depth,
+            calls=state.calls,
+            total_wait_time=state.total_wait_time,
+            max_wait_time=state.max_wait_time,
+        )
+
+
+_thread_limiters: dict[str, ThreadLimiter] = {
+    name: ThreadLimiter(name) for name in ("endpoints", "file-io", "background")
+}
+
+# The limiters configured by the application handling the current request, if
+# it configures any.
+app_thread_limiters: contextvars.ContextVar[
+    typing.Mapping[str, ThreadLimiter] | None
+] = contextvars.ContextVar("starlette.app_thread_limiters", default=None)
+
+
+def configure_thread_limiter(name: str, total_tokens: int | None) -> ThreadLimiter:
+    """
+    Set the number of worker threads available to the limiter called `name`
+    throughout the process, creating it if needed.
+    """
+    limiter = _thread_limiters.get(name)
+    if limiter is None:
+        limiter = _thread_limiters[name] = ThreadLimiter(name, total_tokens)
+    else:
+        limiter.total_tokens = total_tokens
+    return limiter
+
+
+def get_thread_limiter(name: str) -> ThreadLimiter:
+    """
+    Return the limiter called `name` of the application handling the current
+    request, or the limiter shared by the process if the application doesn't
+    configure one.
+    """
+    limiters = app_thread_limiters.get()
+    if limiters is not None and name in limiters:
+        return limiters[name]
+    assert name in _thread_limiters, f"No thread limiter named {name!r}."
+    return _thread_limiters[name]
+
+
+async def _run_sync(
+    limiter: ThreadLimiter | None, func: typing.Callable[..., T], *args: typing.Any
+) -> T:
+    if limiter is None:
+        return await anyio.to_thread.run_sync(func, *args)
+    return await limiter.run(func, *args)
+
+
 class _StopIteration(Exception):
     pass
 
@@ -58,10 +224,80 @@ def _next(iterator: typing.Iterator[T]) -> T:
 
 async def iterate_in_threadpool(
     iterator: typing.Iterable[T],
+    *,
+    limiter: ThreadLimiter | None = None,
 ) -> typing.AsyncIterator[T]:
     as_iterator = iter(iterator)
     while True:
         try:
-            yield await anyio.to_thread.run_sync(_next, as_iterator)
+            yield await _run_sync(limiter, _next, as_iterator)
         except _StopIteration:
             break
+
+
+def _next_batch(
+    iterator: typing.Iterator[T],
+    max_items: int | None,
+    max_bytes: int | None,
+    max_wait: float | None,
+) -> tuple[list[T], bool, Exception | None]:
+    # Returns the batch, whether the iterator is exhausted, and any exception
+    # raised after some items were collected, to be raised once they've been
+    # yielded.
+    batch: list[T] = []
+    size = 0
+    deadline = None if max_wait is None else time.monotonic() + max_wait
+    try:
+        for item in iterator:
+            batch.append(item)
+            if max_items is not None and len(batch) >= max_items:
+                break
+            if max_bytes is not None and isinstance(item, (bytes, str)):
+                size += len(item)
+                if not item or size >= max_bytes:
+                    break
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+        else:
+            return batch, True, None
+    except Exception as exc:
+        if not batch:
+            raise
+        return batch, True, exc
+    return batch, False, None
+
+
+async def iterate_in_threadpool_batched(
+    iterator: typing.Iterable[T],
+    *,
+    max_items: int | None = 64,
+    max_bytes: int | None = None,
+    max_wait: float | None = None,
+    limiter: ThreadLimiter | None = None,
+) -> typing.AsyncIterator[T]:
+    """
+    Like `iterate_in_threadpool`, but pull items from the threadpool in batches,
+    saving a round trip to a worker thread for every item.
+
+    A batch ends after `max_items` items, once the `bytes` or `str` items add
+    up to `max_bytes`, after an empty `bytes` or `str` item when `max_bytes` is
+    set, or once `max_wait` seconds have passed since the batch started. The
+    time is only checked as each item arrives, and an item is only yielded once
+    its whole batch has been pulled, so iterators that block between items are
+    better served by `iterate_in_threadpool`.
+
+    Both run within `limiter`, if given, rather than anyio's default limit.
+    """
+    assert (
+        max_items is not None or max_bytes is not None
+    ), "One of max_items or max_bytes must be set."
+    as_iterator = iter(iterator)
+    exhausted = False
+    while not exhausted:
+        batch, exhausted, exc = await _run_sync(
+            limiter, _next_batch, as_iterator, max_items, max_bytes, max_wait
+        )
+        for item in batch:
+            yield item
+        if exc is not None:
+            raise exc
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import re
 import typing
 from shlex import shlex
-from urllib.parse import SplitResult, parse_qsl, urlencode, urlsplit
+from urllib.parse import SplitResult, parse_qsl, unquote_plus, urlencode, urlsplit
 
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import get_thread_limiter
 from starlette.types import Scope
 
 
@@ -19,14 +20,50 @@ _KeyType = typing.TypeVar("_KeyType")
 # that is, you can't do `Mapping[str, Animal]()["fido"] = Dog()`
 _CovariantValueType = typing.TypeVar("_CovariantValueType", covariant=True)
 
+DEFAULT_PORTS = {"http": 80, "https": 443, "ws": 80, "wss": 443}
+# Characters that `urlsplit` would treat as a delimiter, strip or validate in
+# each part of a URL.
+_UNSAFE_NETLOC = re.compile(r"[/?#\[\]\t\r\n]")
+_UNSAFE_PATH = re.compile(r"[?#\t\r\n]")
+_UNSAFE_QUERY = re.compile(r"[#\t\r\n]")
+
+
+def _split_parts(
+    scheme: str, netloc: str | None, path: str, query: str
+) -> SplitResult | None:
+    """
+    Return the components that `urlsplit` would find in the URL joined from
+    these parts, or `None` if it might find different ones. A `None` netloc
+    stands for a URL that is just a path and query.
+    """
+    if (
+        (path and path[0] != "/")
+        or _UNSAFE_PATH.search(path) is not None
+        or _UNSAFE_QUERY.search(query) is not None
+    ):
+        return None
+    if netloc is None:
+        return None if path[:2] == "//" else SplitResult("", "", path, query, "")
+    if (
+        netloc
+        and scheme in DEFAULT_PORTS
+        and netloc.isascii()
+        and _UNSAFE_NETLOC.search(netloc) is None
+    ):
+        return SplitResult(scheme, netloc, path, query, "")
+    return None
+
 
 class URL:
+    __slots__ = ("_url", "_components")
+
     def __init__(
         self,
         url: str = "",
         scope: Scope | None = None,
         **components: typing.Any,
     ) -> None:
+        split: SplitResult | None = None
         if scope is not None:
             assert not url, 'Cannot set both "url" and "scope".'
             assert not components, 'Cannot set both "scope" and "**components".'
@@ -41,29 +78,32 @@ class URL:
                     host_header = value.decode("latin-1")
                     break
 
+            netloc: str | None = None
             if host_header is not None:
-                url = f"{scheme}://{host_header}{path}"
-            elif server is None:
-                url = path
-            else:
+                netloc = host_header
+            elif server is not None:
                 host, port = server
-                default_port = {"http": 80, "https": 443, "ws": 80, "wss": 443}[scheme]
-                if port == default_port:
-                    url = f"{scheme}://{host}{path}"
+                if port == DEFAULT_PORTS[scheme]:
+                    netloc = host
                 else:
-                    url = f"{scheme}://{host}:{port}{path}"
+                    netloc = f"{host}:{port}"
+            query = query_string.decode() if query_string else ""
 
-            if query_string:
-                url += "?" + query_string.decode()
+            url = path if netloc is None else f"{scheme}://{netloc}{path}"
+            if query:
+                url += "?" + query
+
+            split = _split_parts(scheme, netloc, path, query)
         elif components:
             assert not url, 'Cannot set both "url" and "**components".'
             url = URL("").replace(**components).components.geturl()
 
         self._url = url
+        self._components = split
 
     @property
     def components(self) -> SplitResult:
-        if not hasattr(self, "_components"):
+        if self._components is None:
             self._components = urlsplit(self._url)
         return self._components
 
@@ -199,7 +239,12 @@ class URLPath(str):
 
         netloc = self.host or base_url.netloc
         path = base_url.path.rstrip("/") + str(self)
-        return URL(scheme=scheme, netloc=netloc, path=path)
+        split = _split_parts(scheme, netloc, path, "")
+        if split is None:
+            return URL(scheme=scheme, netloc=netloc, path=path)
+        url = URL(f"{scheme}://{netloc}{path}")
+        url._components = split
+        return url
 
 
 class Secret:
@@ -251,6 +296,8 @@ class CommaSeparatedStrings(typing.Sequence[str]):
 
 
 class ImmutableMultiDict(typing.Mapping[_KeyType, _CovariantValueType]):
+    __slots__ = ("_dict", "_list")
+
     _dict: typing.Dict[_KeyType, _CovariantValueType]
 
     def __init__(
@@ -325,6 +372,8 @@ class ImmutableMultiDict(typing.Mapping[_KeyType, _CovariantValueType]):
 
 
 class MultiDict(ImmutableMultiDict[typing.Any, typing.Any]):
+    __slots__ = ()
+
     def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
         self.setlist(key, [value])
 
@@ -385,8 +434,14 @@ class MultiDict(ImmutableMultiDict[typing.Any, typing.Any]):
 class QueryParams(ImmutableMultiDict[str, str]):
     """
     An immutable multidict.
+
+    When created from a query string, parsing is deferred until the parameters
+    are first needed. Until then, looking up a single key only decodes the
+    entries with that key.
     """
 
+    __slots__ = ("_query_string",)
+
     def __init__(
         self,
         *args: ImmutableMultiDict[typing.Any, typing.Any]
@@ -399,7 +454,14 @@ class QueryParams(ImmutableMultiDict[str, str]):
         assert len(args) < 2, "Too many arguments."
 
         value = args[0] if args else []
-
+        self._query_string: str | None = None
+
+        if isinstance(value, (str, bytes)) and not kwargs:
+            if isinstance(value, bytes):
+                value = value.decode("latin-1")
+            # `_list` and `_dict` are left unset until `__getattr__` parses.
+            self._query_string = value
+            return
         if isinstance(value, str):
             super().__init__(parse_qsl(value, keep_blank_values=True), **kwargs)
         elif isinstance(value, bytes):
@@ -411,6 +473,48 @@ class QueryParams(ImmutableMultiDict[str, str]):
         self._list = [(str(k), str(v)) for k, v in self._list]
         self._dict = {str(k): str(v) for k, v in self._dict.items()}
 
+    def __getattr__(self, name: str) -> typing.Any:
+        if name in ("_list", "_dict") and self._query_string is not None:
+            self._list = parse_qsl(self._query_string, keep_blank_values=True)
+            self._dict = {k: v for k, v in self._list}
+            self._query_string = None
+            return getattr(self, name)
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute {name!r}"
+        )
+
+    def _lookup(self, key: typing.Any) -> list[str]:
+        """
+        Return the values of `key` from the unparsed query string.
+        """
+        assert self._query_string is not None
+        values: list[str] = []
+        for entry in self._query_string.split("&"):
+            name = entry.partition("=")[0]
+            if "%" in name or "+" in name:
+                name = unquote_plus(name)
+            if name == key:
+                values += [v for _, v in parse_qsl(entry, keep_blank_values=True)]
+        return values
+
+    def getlist(self, key: typing.Any) -> list[str]:
+        if self._query_string is None:
+            return super().getlist(key)
+        return self._lookup(key)
+
+    def __getitem__(self, key: str) -> str:
+        if self._query_string is None:
+            return self._dict[key]
+        values = self._lookup(key)
+        if not values:
+            raise KeyError(key)
+        return values[-1]
+
+    def __contains__(self, key: typing.Any) -> bool:
+        if self._query_string is None:
+            return key in self._dict
+        return bool(self._lookup(key))
+
     def __str__(self) -> str:
         return urlencode(self._list)
 
@@ -425,6 +529,8 @@ class UploadFile:
     An uploaded file included as part of the request data.
     """
 
+    __slots__ = ("file", "size", "filename", "headers")
+
     def __init__(
         self,
         file: typing.BinaryIO,
@@ -455,24 +561,24 @@ class UploadFile:
         if self._in_memory:
             self.file.write(data)
         else:
-            await run_in_threadpool(self.file.write, data)
+            await get_thread_limiter("file-io").run(self.file.write, data)
 
     async def read(self, size: int = -1) -> bytes:
         if self._in_memory:
             return self.file.read(size)
-        return await run_in_threadpool(self.file.read, size)
+        return await get_thread_limiter("file-io").run(self.file.read, size)
 
     async def seek(self, offset: int) -> None:
         if self._in_memory:
             self.file.seek(offset)
         else:
-            await run_in_threadpool(self.file.seek, offset)
+            await get_thread_limiter("file-io").run(self.file.seek, offset)
 
     async def close(self) -> None:
         if self._in_memory:
             self.file.close()
         else:
-            await run_in_threadpool(self.file.close)
+            await get_thread_limiter("file-io").run(self.file.close)
 
     def __repr__(self) -> str:
         return (
@@ -488,6 +594,8 @@ class FormData(ImmutableMultiDict[str, typing.Union[UploadFile, str]]):
     An immutable multidict, containing both file uploads and text input.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         *args: FormData
@@ -503,11 +611,17 @@ class FormData(ImmutableMultiDict[str, typing.Union[UploadFile, str]]):
                 await value.close()
 
 
+# Shorter header lists are scanned rather than indexed.
+HEADERS_INDEX_MIN_LENGTH = 8
+
+
 class Headers(typing.Mapping[str, str]):
     """
     An immutable, case-insensitive multidict.
     """
 
+    __slots__ = ("_list", "_index", "_owned", "_scanned")
+
     def __init__(
         self,
         headers: typing.Mapping[str, str] | None = None,
@@ -515,6 +629,8 @@ class Headers(typing.Mapping[str, str]):
         scope: typing.MutableMapping[str, typing.Any] | None = None,
     ) -> None:
         self._list: list[tuple[bytes, bytes]] = []
+        # Only lists that no one else can change are indexed.
+        self._owned = raw is None and scope is None
         if headers is not None:
             assert raw is None, 'Cannot set both "headers" and "raw".'
             assert scope is None, 'Cannot set both "headers" and "scope".'
@@ -529,6 +645,42 @@ class Headers(typing.Mapping[str, str]):
             # scope["headers"] isn't necessarily a list
             # it might be a tuple or other iterable
             self._list = scope["headers"] = list(scope["headers"])
+        self._index: dict[bytes, list[int]] | None = None
+        self._scanned = False
+
+    def _positions(self, key: bytes) -> list[int]:
+        """
+        Return the positions of `key` in the header list.
+
+        Longer lists that are looked up more than once get an index of the
+        positions of each key, which `MutableHeaders` keeps up to date. Lists
+        given as `raw` or taken from the ASGI scope may be changed by others
+        without the index knowing, so lookups in them always scan the list.
+        """
+        index = self._index
+        if index is not None:
+            return index.get(key, [])
+        elif (
+            not self._owned
+            or not self._scanned
+            or len(self._list) < HEADERS_INDEX_MIN_LENGTH
+        ):
+            # Short lists and first lookups are cheaper to scan than to build an
+            # index that may not be reused.
+            self._index = None
+            self._scanned = True
+            return [
+                position
+                for position, (item_key, _) in enumerate(self._list)
+                if item_key == key
+            ]
+        index = self._index = {}
+        for position, (item_key, _) in enumerate(self._list):
+            if item_key in index:
+                index[item_key].append(position)
+            else:
+                index[item_key] = [position]
+        return index.get(key, [])
 
     @property
     def raw(self) -> list[tuple[bytes, bytes]]:
@@ -549,27 +701,35 @@ class Headers(typing.Mapping[str, str]):
     def getlist(self, key: str) -> list[str]:
         get_header_key = key.lower().encode("latin-1")
         return [
-            item_value.decode("latin-1")
-            for item_key, item_value in self._list
-            if item_key == get_header_key
+            self._list[position][1].decode("latin-1")
+            for position in self._positions(get_header_key)
         ]
 
     def mutablecopy(self) -> MutableHeaders:
-        return MutableHeaders(raw=self._list[:])
+        headers = MutableHeaders(raw=self._list[:])
+        headers._owned = True
+        return headers
 
     def __getitem__(self, key: str) -> str:
         get_header_key = key.lower().encode("latin-1")
-        for header_key, header_value in self._list:
-            if header_key == get_header_key:
-                return header_value.decode("latin-1")
-        raise KeyError(key)
+        if not self._owned or len(self._list) < HEADERS_INDEX_MIN_LENGTH:
+            for header_key, header_value in self._list:
+                if header_key == get_header_key:
+                    return header_value.decode("latin-1")
+            raise KeyError(key)
+        positions = self._positions(get_header_key)
+        if not positions:
+            raise KeyError(key)
+        return self._list[positions[0]][1].decode("latin-1")
 
     def __contains__(self, key: typing.Any) -> bool:
         get_header_key = key.lower().encode("latin-1")
-        for header_key, header_value in self._list:
-            if header_key == get_header_key:
-                return True
-        return False
+        if not self._owned or len(self._list) < HEADERS_INDEX_MIN_LENGTH:
+            for header_key, header_value in self._list:
+                if header_key == get_header_key:
+                    return True
+            return False
+        return bool(self._positions(get_header_key))
 
     def __iter__(self) -> typing.Iterator[typing.Any]:
         return iter(self.keys())
@@ -591,6 +751,8 @@ class Headers(typing.Mapping[str, str]):
 
 
 class MutableHeaders(Headers):
+    __slots__ = ()
+
     def __setitem__(self, key: str, value: str) -> None:
         """
         Set the header `key` to `value`, removing any duplicate entries.
@@ -599,19 +761,16 @@ class MutableHeaders(Headers):
         set_key = key.lower().encode("latin-1")
         set_value = value.encode("latin-1")
 
-        found_indexes: "typing.List[int]" = []
-        for idx, (item_key, item_value) in enumerate(self._list):
-            if item_key == set_key:
-                found_indexes.append(idx)
-
-        for idx in reversed(found_indexes[1:]):
-            del self._list[idx]
+        found_indexes = self._positions(set_key)
+        if not found_indexes:
+            self._append(set_key, set_value)
+            return
 
-        if found_indexes:
-            idx = found_indexes[0]
-            self._list[idx] = (set_key, set_value)
-        else:
-            self._list.append((set_key, set_value))
+        self._list[found_indexes[0]] = (set_key, set_value)
+        if len(found_indexes) > 1:
+            for idx in reversed(found_indexes[1:]):
+                del self._list[idx]
+            self._index = None
 
     def __delitem__(self, key: str) -> None:
         """
@@ -619,13 +778,19 @@ class MutableHeaders(Headers):
         """
         del_key = key.lower().encode("latin-1")
 
-        pop_indexes: "typing.List[int]" = []
-        for idx, (item_key, item_value) in enumerate(self._list):
-            if item_key == del_key:
-                pop_indexes.append(idx)
+        pop_indexes = self._positions(del_key)
+        if not pop_indexes:
+            return
 
         for idx in reversed(pop_indexes):
             del self._list[idx]
+        if self._index is not None:
+            if pop_indexes[0] == len(self._list):
+                # Only trailing entries were removed, so the others keep
+                # their positions.
+                del self._index[del_key]
+            else:
+                self._index = None
 
     def __ior__(self, other: typing.Mapping[str, str]) -> MutableHeaders:
         if not isinstance(other, typing.Mapping):
@@ -642,6 +807,9 @@ class MutableHeaders(Headers):
 
     @property
     def raw(self) -> list[tuple[bytes, bytes]]:
+        # The list may be changed through the returned reference from now on.
+        self._owned = False
+        self._index = None
         return self._list
 
     def setdefault(self, key: str, value: str) -> str:
@@ -652,10 +820,10 @@ class MutableHeaders(Headers):
         set_key = key.lower().encode("latin-1")
         set_value = value.encode("latin-1")
 
-        for idx, (item_key, item_value) in enumerate(self._list):
-            if item_key == set_key:
-                return item_value.decode("latin-1")
-        self._list.append((set_key, set_value))
+        found_indexes = self._positions(set_key)
+        if found_indexes:
+            return self._list[found_indexes[0]][1].decode("latin-1")
+        self._append(set_key, set_value)
         return value
 
     def update(self, other: typing.Mapping[str, str]) -> None:
@@ -668,7 +836,16 @@ class MutableHeaders(Headers):
         """
         append_key = key.lower().encode("latin-1")
         append_value = value.encode("latin-1")
-        self._list.append((append_key, append_value))
+        self._append(append_key, append_value)
+
+    def _append(self, key: bytes, value: bytes) -> None:
+        index = self._index
+        if index is not None:
+            if key in index:
+                index[key].append(len(self._list))
+            else:
+                index[key] = [len(self._list)]
+        self._list.append((key, value))
 
     def add_vary_header(self, vary: str) -> None:
         existing = self.get("vary")
@@ -684,6 +861,8 @@ class State:
     Used for `request.state` and `app.state`.
     """
 
+    __slots__ = ("_state",)
+
     _state: dict[str, typing.Any]
 
     def __init__(self, state: dict[str, typing.Any] | None = None):
@@ -5,7 +5,7 @@ import typing
 
 from starlette import status
 from starlette._utils import is_async_callable
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import get_thread_limiter
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse, Response
@@ -43,7 +43,7 @@ class HTTPEndpoint:
         if is_async:
             response = await handler(request)
         else:
-            response = await run_in_threadpool(handler, request)
+            response = await get_thread_limiter("endpoints").run(handler, request)
         await response(self.scope, self.receive, self.send)
 
     async def method_not_allowed(self, request: Request) -> Response:
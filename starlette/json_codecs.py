@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import typing
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: nocover
+    orjson = None  # type: ignore[assignment]
+
+
+class JSONCodec:
+    """
+    Serializes the content of a `JSONResponse`, and parses `Request.json()`.
+    """
+
+    def dumps(self, content: typing.Any) -> bytes:
+        raise NotImplementedError()  # pragma: no cover
+
+    def loads(self, data: bytes) -> typing.Any:
+        raise NotImplementedError()  # pragma: no cover
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    The default codec, using the standard library `json` module.
+    """
+
+    def dumps(self, content: typing.Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> typing.Any:
+        return json.loads(data)
+
+
+class ORJSONCodec(JSONCodec):
+    """
+    A codec using `orjson`, which writes bytes directly. Its output differs from
+    the standard library codec in a few cases: `NaN` and infinities are
+    serialized as `null` rather than rejected, dict keys must be strings, and
+    integers are limited to 64 bits. `option` is passed on to `orjson.dumps()`.
+    """
+
+    def __init__(self, option: int | None = None) -> None:
+        assert orjson is not None, "orjson must be installed to use ORJSONCodec."
+        self.option = option
+
+    def dumps(self, content: typing.Any) -> bytes:
+        return orjson.dumps(content, option=self.option)
+
+    def loads(self, data: bytes) -> typing.Any:
+        return orjson.loads(data)
+
+
+default_json_codec = StdlibJSONCodec()
+
+_registry: dict[str, JSONCodec] = {"json": default_json_codec}
+if orjson is not None:
+    _registry["orjson"] = ORJSONCodec()
+
+# The codec of the application handling the current request, if it sets one.
+app_json_codec: contextvars.ContextVar[JSONCodec | None] = contextvars.ContextVar(
+    "starlette.app_json_codec", default=None
+)
+
+
+def register_json_codec(name: str, codec: JSONCodec) -> None:
+    _registry[name] = codec
+
+
+def get_json_codec(codec: str | JSONCodec) -> JSONCodec:
+    """
+    Return `codec`, looking it up by name if it's a string.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    assert codec in _registry, f"No JSON codec registered as {codec!r}."
+    return _registry[codec]
+
+
+def current_json_codec() -> JSONCodec:
+    """
+    Return the codec of the application handling the current request, or the
+    default codec.
+    """
+    codec = app_json_codec.get()
+    return default_json_codec if codec is None else codec
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import sys
-from typing import Any, Iterator, Protocol
+from typing import Any, Awaitable, Callable, Iterator, Protocol, Sequence
 
 if sys.version_info >= (3, 10):  # pragma: no cover
     from typing import ParamSpec
@@ -42,3 +42,79 @@ class Middleware:
         option_strings = [f"{key}={value!r}" for key, value in self.kwargs.items()]
         args_repr = ", ".join([self.cls.__name__] + args_strings + option_strings)
         return f"{class_name}({args_repr})"
+
+
+_SCOPE_TYPES = ("http", "websocket", "lifespan")
+
+
+def _declared_scope_types(cls: Any) -> frozenset[str] | None:
+    """
+    Return the scope types that a middleware class declares it handles, with a
+    `scope_types` class attribute. Any other scope is passed straight through to
+    the wrapped app, so the middleware can be skipped for it.
+
+    The declaration only counts if it is made by the class that implements
+    `__call__`, or by one of its subclasses.
+    """
+    for klass in getattr(cls, "__mro__", ()):
+        if "scope_types" in vars(klass):
+            return frozenset(klass.scope_types)
+        if "__call__" in vars(klass):
+            break
+    return None
+
+
+class _ScopeTypeDispatch:
+    """
+    Hand each scope over to the app for its scope type, without adding a
+    coroutine frame of its own.
+    """
+
+    def __init__(self, apps: dict[str | None, ASGIApp]) -> None:
+        self.apps = apps
+        self.default = apps.get(None)
+
+    def __call__(self, scope: Scope, receive: Receive, send: Send) -> Awaitable[None]:
+        app = self.apps.get(scope["type"], self.default)
+        assert app is not None
+        return app(scope, receive, send)
+
+
+def _dispatch(apps: dict[str | None, ASGIApp]) -> ASGIApp:
+    first, *others = apps.values()
+    if all(app is first for app in others):
+        return first
+    return _ScopeTypeDispatch(apps)
+
+
+def build_middleware_stack(
+    app: ASGIApp,
+    middleware: Sequence[Middleware],
+    scope_types: Sequence[str | None] = (*_SCOPE_TYPES, None),
+    instrument: Callable[[ASGIApp], ASGIApp] | None = None,
+) -> ASGIApp:
+    """
+    Wrap `app` in `middleware`, the first of which is the outermost.
+
+    Each middleware is instantiated once, as usual, but it is only called for
+    the scope types that it declares, among the `scope_types` that can reach
+    the stack. `None` stands for any other scope type.
+
+    If given, `instrument` is called with each middleware instance, and
+    returns the app to use in its place.
+    """
+    apps: dict[str | None, ASGIApp] = {scope_type: app for scope_type in scope_types}
+    for cls, args, kwargs in reversed(middleware):
+        handled = _declared_scope_types(cls)
+        applies = [
+            scope_type
+            for scope_type in scope_types
+            if handled is None or scope_type in handled
+        ]
+        downstream = {scope_type: apps[scope_type] for scope_type in applies or apps}
+        instance = cls(_dispatch(downstream), *args, **kwargs)
+        if instrument is not None:
+            instance = instrument(instance)
+        for scope_type in applies:
+            apps[scope_type] = instance
+    return _dispatch(apps)
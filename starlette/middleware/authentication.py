@@ -12,6 +12,8 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 class AuthenticationMiddleware:
+    scope_types = ("http", "websocket")
+
     def __init__(
         self,
         app: ASGIApp,
@@ -27,7 +29,7 @@ class AuthenticationMiddleware:
         ] = on_error if on_error is not None else self.default_on_error
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] not in ["http", "websocket"]:
+        if scope["type"] not in ["http", "websocket"]:  # pragma: no cover
             await self.app(scope, receive, send)
             return
 
@@ -24,6 +24,12 @@ class _CachedRequest(Request):
     empty body so that downstream things don't hang forever.
     """
 
+    __slots__ = (
+        "_wrapped_rcv_disconnected",
+        "_wrapped_rcv_consumed",
+        "_wrapped_rc_stream",
+    )
+
     def __init__(self, scope: Scope, receive: Receive):
         super().__init__(scope, receive)
         self._wrapped_rcv_disconnected = False
@@ -57,7 +63,7 @@ class _CachedRequest(Request):
             return msg
 
         # wrapped_rcv state 3: not yet consumed
-        if getattr(self, "_body", None) is not None:
+        if self._body is not None:
             # body() was called, we return it even if the client disconnected
             self._wrapped_rcv_consumed = True
             return {
@@ -92,14 +98,30 @@ class _CachedRequest(Request):
 
 
 class BaseHTTPMiddleware:
+    """
+    Write middleware against a request/response interface.
+
+    With `passthrough_body=True`, a response returned unchanged from `call_next`
+    has its body messages forwarded straight from the downstream app, rather
+    than being re-streamed through a `StreamingResponse`. Headers and the status
+    code may still be modified. Detecting a client disconnect while the body is
+    being sent is then left to the downstream app.
+    """
+
+    scope_types = ("http",)
+
     def __init__(
-        self, app: ASGIApp, dispatch: typing.Optional[DispatchFunction] = None
+        self,
+        app: ASGIApp,
+        dispatch: typing.Optional[DispatchFunction] = None,
+        passthrough_body: bool = False,
     ) -> None:
         self.app = app
         self.dispatch_func = self.dispatch if dispatch is None else dispatch
+        self.passthrough_body = passthrough_body
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] != "http":
+        if scope["type"] != "http":  # pragma: no cover
             await self.app(scope, receive, send)
             return
 
@@ -167,7 +189,11 @@ class BaseHTTPMiddleware:
 
             assert message["type"] == "http.response.start"
 
+            body_started = False
+
             async def body_stream() -> typing.AsyncGenerator[bytes, None]:
+                nonlocal body_started
+                body_started = True
                 async with recv_stream:
                     async for message in recv_stream:
                         assert message["type"] == "http.response.body"
@@ -180,8 +206,27 @@ class BaseHTTPMiddleware:
                 if app_exc is not None:
                     raise app_exc
 
+            async def forward_body(send: Send, start: typing.List[Message]) -> bool:
+                if body_started:
+                    return False
+                for message in start:
+                    await send(message)
+                async with recv_stream:
+                    async for message in recv_stream:
+                        assert message["type"] == "http.response.body"
+                        await send(message)
+                        if not message.get("more_body", False):
+                            break
+
+                if app_exc is not None:
+                    raise app_exc
+                return True
+
             response = _StreamingResponse(
-                status_code=message["status"], content=body_stream(), info=info
+                status_code=message["status"],
+                content=body_stream(),
+                info=info,
+                forward_body=forward_body if self.passthrough_body else None,
             )
             response.raw_headers = message["headers"]
             return response
@@ -207,9 +252,35 @@ class _StreamingResponse(StreamingResponse):
         media_type: typing.Optional[str] = None,
         background: typing.Optional[BackgroundTask] = None,
         info: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        forward_body: typing.Optional[
+            typing.Callable[[Send, typing.List[Message]], typing.Awaitable[bool]]
+        ] = None,
     ) -> None:
         self._info = info
+        self._forward_body = forward_body
         super().__init__(content, status_code, headers, media_type, background)
+        self._content = self.body_iterator
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self._forward_body is None or self.body_iterator is not self._content:
+            await super().__call__(scope, receive, send)
+            return
+
+        start: typing.List[Message] = [
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        ]
+        if self._info:
+            start.insert(0, {"type": "http.response.debug", "info": self._info})
+        if not await self._forward_body(send, start):
+            # The dispatch function has already started reading the body.
+            await super().__call__(scope, receive, send)
+            return
+        if self.background is not None:
+            await self.background()
 
     async def stream_response(self, send: Send) -> None:
         if self._info:
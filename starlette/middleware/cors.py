@@ -2,6 +2,7 @@ import functools
 import re
 import typing
 
+from starlette._utils import get_headers
 from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import PlainTextResponse, Response
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
@@ -11,6 +12,8 @@ SAFELISTED_HEADERS = {"Accept", "Accept-Language", "Content-Language", "Content-
 
 
 class CORSMiddleware:
+    scope_types = ("http",)
+
     def __init__(
         self,
         app: ASGIApp,
@@ -76,7 +79,7 @@ class CORSMiddleware:
             return
 
         method = scope["method"]
-        headers = Headers(scope=scope)
+        headers = get_headers(scope)
         origin = headers.get("origin")
 
         if origin is None:
@@ -4,7 +4,7 @@ import traceback
 import typing
 
 from starlette._utils import is_async_callable
-from starlette.concurrency import run_in_threadpool
+from starlette.concurrency import get_thread_limiter
 from starlette.requests import Request
 from starlette.responses import HTMLResponse, PlainTextResponse, Response
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
@@ -134,6 +134,8 @@ class ServerErrorMiddleware:
     always result in an appropriate 500 response.
     """
 
+    scope_types = ("http",)
+
     def __init__(
         self,
         app: ASGIApp,
@@ -147,7 +149,7 @@ class ServerErrorMiddleware:
         self.debug = debug
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] != "http":
+        if scope["type"] != "http":  # pragma: no cover
             await self.app(scope, receive, send)
             return
 
@@ -175,7 +177,9 @@ class ServerErrorMiddleware:
                 if is_async_callable(self.handler):
                     response = await self.handler(request, exc)
                 else:
-                    response = await run_in_threadpool(self.handler, request, exc)
+                    response = await get_thread_limiter("endpoints").run(
+                        self.handler, request, exc
+                    )
 
             if not response_started:
                 await response(scope, receive, send)
@@ -13,6 +13,8 @@ from starlette.websockets import WebSocket
 
 
 class ExceptionMiddleware:
+    scope_types = ("http", "websocket")
+
     def __init__(
         self,
         app: ASGIApp,
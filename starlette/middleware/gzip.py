@@ -2,11 +2,14 @@ import gzip
 import io
 import typing
 
+from starlette._utils import get_headers
 from starlette.datastructures import Headers, MutableHeaders
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class GZipMiddleware:
+    scope_types = ("http",)
+
     def __init__(
         self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9
     ) -> None:
@@ -16,7 +19,7 @@ class GZipMiddleware:
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] == "http":
-            headers = Headers(scope=scope)
+            headers = get_headers(scope)
             if "gzip" in headers.get("Accept-Encoding", ""):
                 responder = GZipResponder(
                     self.app, self.minimum_size, compresslevel=self.compresslevel
@@ -0,0 +1,56 @@
+import typing
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RESPONSE_START_MESSAGES = ("http.response.start", "websocket.accept")
+
+
+class HookMiddleware:
+    """
+    A base class for middleware that acts before a connection is handled, and
+    when the response starts, without wrapping the response body.
+
+    Override `before_request(conn)` to inspect the incoming connection. It may
+    return an ASGI app, such as a `Response` or a `WebSocketClose`, to reply
+    without calling the downstream app.
+
+    Override `on_response_start(conn, message)` to inspect or modify the
+    `http.response.start` or `websocket.accept` message before it is sent.
+    """
+
+    scope_types = ("http", "websocket")
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._wrap_send = (
+            type(self).on_response_start is not HookMiddleware.on_response_start
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+
+        conn = HTTPConnection(scope, receive)
+        reply = await self.before_request(conn)
+        if reply is not None:
+            await reply(scope, receive, send)
+            return
+
+        if not self._wrap_send:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] in RESPONSE_START_MESSAGES:
+                await self.on_response_start(conn, message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def before_request(self, conn: HTTPConnection) -> typing.Optional[ASGIApp]:
+        return None
+
+    async def on_response_start(self, conn: HTTPConnection, message: Message) -> None:
+        pass  # pragma: no cover
@@ -4,6 +4,8 @@ from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 class HTTPSRedirectMiddleware:
+    scope_types = ("http", "websocket")
+
     def __init__(self, app: ASGIApp) -> None:
         self.app = app
 
@@ -11,6 +11,8 @@ from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class SessionMiddleware:
+    scope_types = ("http", "websocket")
+
     def __init__(
         self,
         app: ASGIApp,
@@ -41,8 +43,9 @@ class SessionMiddleware:
         connection = HTTPConnection(scope)
         initial_session_was_empty = True
 
-        if self.session_cookie in connection.cookies:
-            data = connection.cookies[self.session_cookie].encode("utf-8")
+        cookie = connection.get_cookie(self.session_cookie)
+        if cookie is not None:
+            data = cookie.encode("utf-8")
             try:
                 data = self.signer.unsign(data, max_age=self.max_age)
                 scope["session"] = json.loads(b64decode(data))
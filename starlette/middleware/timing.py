@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import bisect
+import time
+import typing
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+)
+
+
+class MiddlewareTimingCollector:
+    """
+    Receives the time spent in each instrumented layer of a request, excluding
+    the time spent in the layers that it wraps.
+    """
+
+    def record(self, layer: str, before_start: float, after_start: float) -> None:
+        """
+        Called once per layer and per request, with the seconds spent in the
+        layer before and after the response started. For connections that
+        don't send `http.response.start`, everything is counted as before.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class TimingHistogram:
+    def __init__(self, buckets: typing.Sequence[float]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(count={self.count}, sum={self.sum!r})"
+
+
+class MiddlewareTimingHistogram(MiddlewareTimingCollector):
+    """
+    Collects the timings in memory, as one pair of histograms per layer.
+    `buckets` are the upper bounds in seconds, with a final bucket for any
+    larger value.
+    """
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.layers: dict[str, dict[str, TimingHistogram]] = {}
+
+    def record(self, layer: str, before_start: float, after_start: float) -> None:
+        histograms = self.layers.get(layer)
+        if histograms is None:
+            histograms = self.layers[layer] = {
+                "before_start": TimingHistogram(self.buckets),
+                "after_start": TimingHistogram(self.buckets),
+            }
+        histograms["before_start"].observe(before_start)
+        histograms["after_start"].observe(after_start)
+
+
+class TimedLayer:
+    """
+    Time an ASGI app. The outermost `TimedLayer` of a request publishes the
+    timings of every layer nested within it once the request is complete.
+    """
+
+    def __init__(
+        self, app: ASGIApp, name: str, collector: MiddlewareTimingCollector
+    ) -> None:
+        self.app = app
+        self.name = name
+        self.collector = collector
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        timings: list[list[typing.Any]] | None = scope.get("starlette.timings")
+        outermost = timings is None
+        if timings is None:
+            timings = scope["starlette.timings"] = []
+        # The layer name, the times it was entered, saw the response start and
+        # returned, and the time spent sending messages on to the outer layers
+        # before and after the response started.
+        entry: list[typing.Any] = [self.name, time.perf_counter(), None, None, 0.0, 0.0]
+        timings.append(entry)
+
+        async def send_wrapper(message: Message) -> None:
+            sent = time.perf_counter()
+            if message["type"] == "http.response.start":
+                entry[2] = sent
+            try:
+                await send(message)
+            finally:
+                entry[4 if entry[2] is None else 5] += time.perf_counter() - sent
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            entry[3] = time.perf_counter()
+            if outermost:
+                del scope["starlette.timings"]
+                self.publish(timings)
+
+    def publish(self, timings: list[list[typing.Any]]) -> None:
+        spans = []
+        for name, entered, started, returned, sending_before, sending_after in timings:
+            if started is None:
+                started = returned
+            spans.append(
+                (
+                    name,
+                    started - entered - sending_before,
+                    returned - started - sending_after,
+                )
+            )
+        # Layers are nested in the order they were entered, so the time spent
+        # within a layer is what's left once the next one is subtracted.
+        spans.append(("", 0.0, 0.0))
+        for (name, before, after), (_, inner_before, inner_after) in zip(
+            spans, spans[1:]
+        ):
+            self.collector.record(
+                name, max(before - inner_before, 0.0), max(after - inner_after, 0.0)
+            )
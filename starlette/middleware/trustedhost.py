@@ -1,6 +1,7 @@
 import typing
 
-from starlette.datastructures import URL, Headers
+from starlette._utils import get_headers
+from starlette.datastructures import URL
 from starlette.responses import PlainTextResponse, RedirectResponse, Response
 from starlette.types import ASGIApp, Receive, Scope, Send
 
@@ -8,6 +9,8 @@ ENFORCE_DOMAIN_WILDCARD = "Domain wildcard patterns must be like '*.example.com'
 
 
 class TrustedHostMiddleware:
+    scope_types = ("http", "websocket")
+
     def __init__(
         self,
         app: ASGIApp,
@@ -34,7 +37,7 @@ class TrustedHostMiddleware:
             await self.app(scope, receive, send)
             return
 
-        headers = Headers(scope=scope)
+        headers = get_headers(scope)
         host = headers.get("host", "").split(":")[0]
         is_valid_host = False
         found_www_redirect = False
@@ -7,6 +7,7 @@ import warnings
 import anyio
 from anyio.abc import ObjectReceiveStream, ObjectSendStream
 
+from starlette.concurrency import get_thread_limiter
 from starlette.types import Receive, Scope, Send
 
 warnings.warn(
@@ -105,7 +106,9 @@ class WSGIResponder:
         async with anyio.create_task_group() as task_group:
             task_group.start_soon(self.sender, send)
             async with self.stream_send:
-                await anyio.to_thread.run_sync(self.wsgi, environ, self.start_response)
+                await get_thread_limiter("endpoints").run(
+                    self.wsgi, environ, self.start_response
+                )
         if self.exc_info is not None:
             raise self.exc_info[0].with_traceback(self.exc_info[1], self.exc_info[2])
 
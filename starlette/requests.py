@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import json
+import functools
 import typing
 from http import cookies as http_cookies
 
 import anyio
 
-from starlette._utils import AwaitableOrContextManager, AwaitableOrContextManagerWrapper
+from starlette._utils import (
+    AwaitableOrContextManager,
+    AwaitableOrContextManagerWrapper,
+    get_headers,
+)
 from starlette.datastructures import URL, Address, FormData, Headers, QueryParams, State
 from starlette.exceptions import HTTPException
 from starlette.formparsers import FormParser, MultiPartException, MultiPartParser
+from starlette.json_codecs import current_json_codec
 from starlette.types import Message, Receive, Scope, Send
 
 try:
@@ -58,19 +63,82 @@ def cookie_parser(cookie_string: str) -> dict[str, str]:
     return cookie_dict
 
 
+def find_cookie(cookie_string: str, name: str) -> str | None:
+    """
+    Return the value of the cookie `name` from a ``Cookie`` HTTP header, as
+    `cookie_parser` would parse it, but without parsing the other cookies.
+    """
+    if not name or "=" in name or ";" in name:
+        return cookie_parser(cookie_string).get(name)
+    # The last cookie with a given name wins, so search from the end.
+    end = len(cookie_string)
+    while True:
+        start = cookie_string.rfind(name, 0, end)
+        if start == -1:
+            return None
+        chunk_start = cookie_string.rfind(";", 0, start) + 1
+        chunk_end = cookie_string.find(";", start)
+        if chunk_end == -1:
+            chunk_end = len(cookie_string)
+        equals = cookie_string.find("=", start, chunk_end)
+        if (
+            equals != -1
+            and not cookie_string[chunk_start:start].strip()
+            and not cookie_string[start + len(name) : equals].strip()
+        ):
+            return http_cookies._unquote(cookie_string[equals + 1 : chunk_end].strip())
+        end = start + len(name) - 1
+
+
 class ClientDisconnect(Exception):
     pass
 
 
+# Marks a lazily computed attribute that may legitimately be `None`.
+_UNSET: typing.Any = object()
+
+
+@functools.lru_cache(maxsize=256)
+def _base_url(
+    scheme: str,
+    host_header: str | None,
+    server: tuple[str, int | None] | None,
+    app_root_path: str,
+) -> URL:
+    path = app_root_path
+    if not path.endswith("/"):
+        path += "/"
+    headers = [] if host_header is None else [(b"host", host_header.encode("latin-1"))]
+    return URL(
+        scope={"scheme": scheme, "server": server, "path": path, "headers": headers}
+    )
+
+
 class HTTPConnection(typing.Mapping[str, typing.Any]):
     """
     A base class for incoming HTTP connections, that is used to provide
     any functionality that is common to both `Request` and `WebSocket`.
     """
 
+    __slots__ = (
+        "scope",
+        "_url",
+        "_base_url",
+        "_headers",
+        "_query_params",
+        "_cookies",
+        "_state",
+    )
+
     def __init__(self, scope: Scope, receive: Receive | None = None) -> None:
         assert scope["type"] in ("http", "websocket")
         self.scope = scope
+        self._url: URL | None = None
+        self._base_url: URL | None = None
+        self._headers: Headers | None = None
+        self._query_params: QueryParams | None = None
+        self._cookies: dict[str, str] | None = None
+        self._state: State | None = None
 
     def __getitem__(self, key: str) -> typing.Any:
         return self.scope[key]
@@ -93,38 +161,37 @@ class HTTPConnection(typing.Mapping[str, typing.Any]):
 
     @property
     def url(self) -> URL:
-        if not hasattr(self, "_url"):
+        if self._url is None:
             self._url = URL(scope=self.scope)
         return self._url
 
     @property
     def base_url(self) -> URL:
-        if not hasattr(self, "_base_url"):
-            base_url_scope = dict(self.scope)
+        if self._base_url is None:
+            scope = self.scope
             # This is used by request.url_for, it might be used inside a Mount which
             # would have its own child scope with its own root_path, but the base URL
             # for url_for should still be the top level app root path.
-            app_root_path = base_url_scope.get(
-                "app_root_path", base_url_scope.get("root_path", "")
+            app_root_path = scope.get("app_root_path", scope.get("root_path", ""))
+            server = scope.get("server")
+            # Base URLs are shared by the requests to the same application root.
+            self._base_url = _base_url(
+                scope.get("scheme", "http"),
+                self.headers.get("host"),
+                None if server is None else tuple(server),
+                app_root_path,
             )
-            path = app_root_path
-            if not path.endswith("/"):
-                path += "/"
-            base_url_scope["path"] = path
-            base_url_scope["query_string"] = b""
-            base_url_scope["root_path"] = app_root_path
-            self._base_url = URL(scope=base_url_scope)
         return self._base_url
 
     @property
     def headers(self) -> Headers:
-        if not hasattr(self, "_headers"):
-            self._headers = Headers(scope=self.scope)
+        if self._headers is None:
+            self._headers = get_headers(self.scope)
         return self._headers
 
     @property
     def query_params(self) -> QueryParams:
-        if not hasattr(self, "_query_params"):
+        if self._query_params is None:
             self._query_params = QueryParams(self.scope["query_string"])
         return self._query_params
 
@@ -134,7 +201,7 @@ class HTTPConnection(typing.Mapping[str, typing.Any]):
 
     @property
     def cookies(self) -> dict[str, str]:
-        if not hasattr(self, "_cookies"):
+        if self._cookies is None:
             cookies: typing.Dict[str, str] = {}
             cookie_header = self.headers.get("cookie")
 
@@ -143,6 +210,19 @@ class HTTPConnection(typing.Mapping[str, typing.Any]):
             self._cookies = cookies
         return self._cookies
 
+    def get_cookie(self, name: str, default: str | None = None) -> str | None:
+        """
+        Return a single cookie, without parsing the others if `cookies` hasn't
+        been read.
+        """
+        if self._cookies is not None:
+            return self._cookies.get(name, default)
+        cookie_header = self.headers.get("cookie")
+        if not cookie_header:
+            return default
+        value = find_cookie(cookie_header, name)
+        return default if value is None else value
+
     @property
     def client(self) -> Address | None:
         # client is a 2 item tuple of (host, port), None or missing
@@ -174,7 +254,7 @@ class HTTPConnection(typing.Mapping[str, typing.Any]):
 
     @property
     def state(self) -> State:
-        if not hasattr(self, "_state"):
+        if self._state is None:
             # Ensure 'state' has an empty dict if it's not already populated.
             self.scope.setdefault("state", {})
             # Create a state instance with a reference to the dict in which it should
@@ -197,7 +277,15 @@ async def empty_send(message: Message) -> typing.NoReturn:
 
 
 class Request(HTTPConnection):
-    _form: typing.Optional[FormData]
+    __slots__ = (
+        "_receive",
+        "_send",
+        "_stream_consumed",
+        "_is_disconnected",
+        "_form",
+        "_body",
+        "_json",
+    )
 
     def __init__(
         self, scope: Scope, receive: Receive = empty_receive, send: Send = empty_send
@@ -208,7 +296,9 @@ class Request(HTTPConnection):
         self._send = send
         self._stream_consumed = False
         self._is_disconnected = False
-        self._form = None
+        self._form: FormData | None = None
+        self._body: bytes | None = None
+        self._json: typing.Any = _UNSET
 
     @property
     def method(self) -> str:
@@ -219,7 +309,7 @@ class Request(HTTPConnection):
         return self._receive
 
     async def stream(self) -> typing.AsyncGenerator[bytes, None]:
-        if hasattr(self, "_body"):
+        if self._body is not None:
             yield self._body
             yield b""
             return
@@ -239,7 +329,7 @@ class Request(HTTPConnection):
         yield b""
 
     async def body(self) -> bytes:
-        if not hasattr(self, "_body"):
+        if self._body is None:
             chunks: "typing.List[bytes]" = []
             async for chunk in self.stream():
                 chunks.append(chunk)
@@ -247,9 +337,9 @@ class Request(HTTPConnection):
         return self._body
 
     async def json(self) -> typing.Any:
-        if not hasattr(self, "_json"):
+        if self._json is _UNSET:
             body = await self.body()
-            self._json = json.loads(body)
+            self._json = current_json_codec().loads(body)
         return self._json
 
     async def _get_form(
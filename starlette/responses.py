@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import http.cookies
-import json
+import itertools
 import os
 import stat
 import typing
@@ -13,12 +13,16 @@ from mimetypes import guess_type
 from urllib.parse import quote
 
 import anyio
-import anyio.to_thread
 
 from starlette._compat import md5_hexdigest
 from starlette.background import BackgroundTask
-from starlette.concurrency import iterate_in_threadpool
+from starlette.concurrency import (
+    get_thread_limiter,
+    iterate_in_threadpool,
+    iterate_in_threadpool_batched,
+)
 from starlette.datastructures import URL, MutableHeaders
+from starlette.json_codecs import JSONCodec, current_json_codec, get_json_codec
 from starlette.types import Receive, Scope, Send
 
 
@@ -168,6 +172,9 @@ class PlainTextResponse(Response):
 
 class JSONResponse(Response):
     media_type = "application/json"
+    # A `JSONCodec`, or the name of a registered one, used instead of the
+    # application's codec.
+    json_codec: JSONCodec | str | None = None
 
     def __init__(
         self,
@@ -180,13 +187,9 @@ class JSONResponse(Response):
         super().__init__(content, status_code, headers, media_type, background)
 
     def render(self, content: typing.Any) -> bytes:
-        return json.dumps(
-            content,
-            ensure_ascii=False,
-            allow_nan=False,
-            indent=None,
-            separators=(",", ":"),
-        ).encode("utf-8")
+        if self.json_codec is None:
+            return current_json_codec().dumps(content)
+        return get_json_codec(self.json_codec).dumps(content)
 
 
 class RedirectResponse(Response):
@@ -210,6 +213,17 @@ ContentStream = typing.Union[AsyncContentStream, SyncContentStream]
 
 
 class StreamingResponse(Response):
+    """
+    Streams the chunks of an iterable or async iterable as the response body.
+
+    By default each chunk is sent as it is produced. With `buffer_size` or
+    `buffer_timeout`, chunks are coalesced until at least `buffer_size` bytes
+    are buffered, or until the oldest buffered chunk has waited
+    `buffer_timeout` seconds. Yielding an empty chunk flushes the buffer. With
+    only `buffer_size`, chunks from a sync iterable are also pulled from the
+    threadpool in batches.
+    """
+
     body_iterator: AsyncContentStream
 
     def __init__(
@@ -219,14 +233,32 @@ class StreamingResponse(Response):
         headers: typing.Mapping[str, str] | None = None,
         media_type: str | None = None,
         background: BackgroundTask | None = None,
+        *,
+        buffer_size: int | None = None,
+        buffer_timeout: float | None = None,
     ) -> None:
         if isinstance(content, typing.AsyncIterable):
             self.body_iterator = content
+        elif buffer_size is None or buffer_timeout is not None:
+            # A batch can't be cut short while the iterator blocks in a worker
+            # thread, so a timed flush needs each chunk as soon as it is made.
+            self.body_iterator = iterate_in_threadpool(
+                content, limiter=get_thread_limiter("endpoints")
+            )
         else:
-            self.body_iterator = iterate_in_threadpool(content)
+            # The chunks are coalesced before being sent, so they can be pulled
+            # from the threadpool in batches of the same size.
+            self.body_iterator = iterate_in_threadpool_batched(
+                content,
+                max_items=None,
+                max_bytes=buffer_size,
+                limiter=get_thread_limiter("endpoints"),
+            )
         self.status_code = status_code
         self.media_type = self.media_type if media_type is None else media_type
         self.background = background
+        self.buffer_size = buffer_size
+        self.buffer_timeout = buffer_timeout
         self.init_headers(headers)
 
     async def listen_for_disconnect(self, receive: Receive) -> None:
@@ -243,13 +275,70 @@ class StreamingResponse(Response):
                 "headers": self.raw_headers,
             }
         )
-        async for chunk in self.body_iterator:
-            if not isinstance(chunk, bytes):
-                chunk = chunk.encode(self.charset)
-            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        if self.buffer_size is None and self.buffer_timeout is None:
+            async for chunk in self.body_iterator:
+                if not isinstance(chunk, bytes):
+                    chunk = chunk.encode(self.charset)
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        else:
+            await self.stream_buffered(send)
 
         await send({"type": "http.response.body", "body": b"", "more_body": False})
 
+    async def stream_buffered(self, send: Send) -> None:
+        buffer_size = self.buffer_size
+        chunks: list[bytes] = []
+        size = 0
+        # Held while sending, so that the timed flushes and the flushes made as
+        # chunks arrive don't reorder the body.
+        lock = anyio.Lock()
+        buffered = anyio.Event()
+
+        async def flush() -> None:
+            nonlocal chunks, size
+            async with lock:
+                if chunks:
+                    body = b"".join(chunks)
+                    chunks = []
+                    size = 0
+                    await send(
+                        {"type": "http.response.body", "body": body, "more_body": True}
+                    )
+
+        async def flush_on_timeout(timeout: float) -> None:
+            nonlocal buffered
+            while True:
+                await buffered.wait()
+                buffered = anyio.Event()
+                await anyio.sleep(timeout)
+                await flush()
+
+        async def stream() -> None:
+            nonlocal size
+            async for chunk in self.body_iterator:
+                if not isinstance(chunk, bytes):
+                    chunk = chunk.encode(self.charset)
+                if not chunk:
+                    await flush()
+                    continue
+                if not chunks:
+                    buffered.set()
+                chunks.append(chunk)
+                size += len(chunk)
+                if buffer_size is not None and size >= buffer_size:
+                    await flush()
+            await flush()
+
+        if self.buffer_timeout is None:
+            await stream()
+            return
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(flush_on_timeout, self.buffer_timeout)
+            await stream()
+            task_group.cancel_scope.cancel()
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         async with anyio.create_task_group() as task_group:
 
@@ -264,6 +353,88 @@ class StreamingResponse(Response):
             await self.background()
 
 
+class StreamingJSONResponse(StreamingResponse):
+    """
+    Streams the items of an iterable or async iterable as a JSON array, or as
+    newline-delimited JSON with `ndjson=True`. Items are encoded `batch_size`
+    at a time, and each batch is sent as one chunk of the body. Items from a
+    sync iterable are also fetched a batch at a time, in the threadpool.
+    """
+
+    media_type = "application/json"
+    # A `JSONCodec`, or the name of a registered one, used instead of the
+    # application's codec.
+    json_codec: JSONCodec | str | None = None
+
+    def __init__(
+        self,
+        content: typing.Iterable[typing.Any] | typing.AsyncIterable[typing.Any],
+        status_code: int = 200,
+        headers: typing.Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        *,
+        ndjson: bool = False,
+        batch_size: int = 100,
+    ) -> None:
+        assert batch_size >= 1, "batch_size must be at least 1."
+        if media_type is None and ndjson:
+            media_type = "application/x-ndjson"
+        self.ndjson = ndjson
+        self.batch_size = batch_size
+        if self.json_codec is None:
+            self.codec = current_json_codec()
+        else:
+            self.codec = get_json_codec(self.json_codec)
+        super().__init__(
+            self.encode_batches(self.iterate_batches(content)),
+            status_code,
+            headers,
+            media_type,
+            background,
+        )
+
+    async def iterate_batches(
+        self, content: typing.Iterable[typing.Any] | typing.AsyncIterable[typing.Any]
+    ) -> typing.AsyncIterator[list[typing.Any]]:
+        if isinstance(content, typing.AsyncIterable):
+            batch = []
+            async for item in content:
+                batch.append(item)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        iterator = iter(content)
+        while True:
+            batch = await get_thread_limiter("endpoints").run(
+                list, itertools.islice(iterator, self.batch_size)
+            )
+            if not batch:
+                return
+            yield batch
+
+    async def encode_batches(
+        self, batches: typing.AsyncIterator[list[typing.Any]]
+    ) -> typing.AsyncIterator[bytes]:
+        dumps = self.codec.dumps
+        if self.ndjson:
+            async for batch in batches:
+                yield b"".join([dumps(item) + b"\n" for item in batch])
+            return
+
+        separator = b"["
+        async for batch in batches:
+            # Encode the batch as one array, then drop its brackets so that
+            # batches can be joined into a single array.
+            yield separator + dumps(batch).strip()[1:-1]
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
 class FileResponse(Response):
     chunk_size = 64 * 1024
 
@@ -318,9 +489,10 @@ class FileResponse(Response):
         self.headers.setdefault("etag", etag)
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        file_io = get_thread_limiter("file-io")
         if self.stat_result is None:
             try:
-                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+                stat_result = await file_io.run(os.stat, self.path)
                 self.set_stat_headers(stat_result)
             except FileNotFoundError:
                 raise RuntimeError(f"File at path {self.path} does not exist.")
@@ -340,10 +512,11 @@ class FileResponse(Response):
         elif "extensions" in scope and "http.response.pathsend" in scope["extensions"]:
             await send({"type": "http.response.pathsend", "path": str(self.path)})
         else:
-            async with await anyio.open_file(self.path, mode="rb") as file:
+            file = await file_io.run(open, self.path, "rb")
+            try:
                 more_body = True
                 while more_body:
-                    chunk = await file.read(self.chunk_size)
+                    chunk = await file_io.run(file.read, self.chunk_size)
                     more_body = len(chunk) == self.chunk_size
                     await send(
                         {
@@ -352,5 +525,8 @@ class FileResponse(Response):
                             "more_body": more_body,
                         }
                     )
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await file_io.run(file.close)
         if self.background is not None:
             await self.background()
@@ -3,26 +3,31 @@ from __future__ import annotations
 import contextlib
 import functools
 import inspect
+import logging
 import re
+import time
 import traceback
 import types
 import typing
 import warnings
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from enum import Enum
 
 from starlette._exception_handler import wrap_app_handling_exceptions
-from starlette._utils import get_route_path, is_async_callable
-from starlette.concurrency import run_in_threadpool
-from starlette.convertors import CONVERTOR_TYPES, Convertor
-from starlette.datastructures import URL, Headers, URLPath
+from starlette._utils import get_headers, get_route_path, is_async_callable
+from starlette.concurrency import get_thread_limiter
+from starlette.convertors import CONVERTOR_TYPES, Convertor, PathConvertor
+from starlette.datastructures import URL, URLPath
 from starlette.exceptions import HTTPException
-from starlette.middleware import Middleware
+from starlette.middleware import _SCOPE_TYPES, Middleware, build_middleware_stack
 from starlette.requests import Request
 from starlette.responses import PlainTextResponse, RedirectResponse, Response
 from starlette.types import ASGIApp, Lifespan, Receive, Scope, Send
 from starlette.websockets import WebSocket, WebSocketClose
 
+logger = logging.getLogger("starlette.routing")
+
 
 class NoMatchFound(Exception):
     """
@@ -73,7 +78,7 @@ def request_response(
             if is_async_callable(func):
                 response = await func(request)
             else:
-                response = await run_in_threadpool(func, request)
+                response = await get_thread_limiter("endpoints").run(func, request)
             await response(scope, receive, send)
 
         await wrap_app_handling_exceptions(app, request)(scope, receive, send)
@@ -100,6 +105,13 @@ def websocket_session(
     return app
 
 
+def get_hostname(scope: Scope) -> str:
+    """
+    Return the hostname of the "host" header, without the port.
+    """
+    return get_headers(scope).get("host", "").split(":")[0]
+
+
 def get_name(endpoint: typing.Callable[..., typing.Any]) -> str:
     if inspect.isroutine(endpoint) or inspect.isclass(endpoint):
         return endpoint.__name__
@@ -120,6 +132,56 @@ def replace_params(
     return path, path_params
 
 
+class _PathBuilder:
+    """
+    A path format, such as "/users/{username}", compiled into its literal and
+    parameter parts, so that paths can be built with a single join rather than
+    a `str.replace()` per parameter.
+    """
+
+    __slots__ = ("head", "tail", "param_convertors")
+
+    def __init__(
+        self, path_format: str, param_convertors: dict[str, Convertor[typing.Any]]
+    ) -> None:
+        parts = [path_format]
+        if param_convertors:
+            pattern = "|".join(re.escape("{%s}" % key) for key in param_convertors)
+            parts = re.split(f"({pattern})", path_format)
+        self.head = parts[0]
+        self.tail = [(parts[i][1:-1], parts[i + 1]) for i in range(1, len(parts), 2)]
+        self.param_convertors = param_convertors
+
+    def build(self, path_params: dict[str, typing.Any]) -> str:
+        """
+        Build the path, given a value for every parameter.
+        """
+        param_convertors = self.param_convertors
+        segments = [self.head]
+        for key, literal in self.tail:
+            segments.append(param_convertors[key].to_string(path_params[key]))
+            segments.append(literal)
+        return "".join(segments)
+
+    def replace(
+        self, path_params: dict[str, typing.Any]
+    ) -> tuple[str, dict[str, typing.Any]]:
+        """
+        Equivalent to `replace_params()`. Parameters that are not given are
+        left in place, and the given ones are popped from `path_params`.
+        """
+        param_convertors = self.param_convertors
+        segments = [self.head]
+        for key, literal in self.tail:
+            if key in path_params:
+                value = path_params.pop(key)
+                segments.append(param_convertors[key].to_string(value))
+            else:
+                segments.append("{%s}" % key)
+            segments.append(literal)
+        return "".join(segments), path_params
+
+
 # Match parameters in URL paths, eg. '{param}', and '{param:int}'
 PARAM_REGEX = re.compile("{([a-zA-Z_][a-zA-Z0-9_]*)(:[a-zA-Z_][a-zA-Z0-9_]*)?}")
 
@@ -182,16 +244,52 @@ def compile_path(
     return re.compile(path_regex), path_format, param_convertors
 
 
+# Wraps an ASGI app so that it is timed under the given layer name.
+_Instrument = typing.Callable[[ASGIApp, str], ASGIApp]
+
+
+def _instrumented_stack(
+    app: ASGIApp,
+    middleware: typing.Sequence[Middleware],
+    scope_types: typing.Sequence[str | None],
+    owner: str,
+    instrument: _Instrument,
+) -> ASGIApp:
+    """
+    Build a middleware stack with every layer timed, including the wrapped app,
+    which is named after the owner of the stack.
+    """
+    return build_middleware_stack(
+        instrument(app, owner),
+        middleware,
+        scope_types,
+        lambda layer: instrument(layer, f"{owner} {type(layer).__name__}"),
+    )
+
+
 class BaseRoute:
     def matches(self, scope: Scope) -> tuple[Match, Scope]:
         raise NotImplementedError()  # pragma: no cover
 
+    def _match(
+        self, scope: Scope, route_path: str
+    ) -> tuple[Match, typing.Match[str] | None]:
+        raise NotImplementedError()  # pragma: no cover
+
+    def _child_scope(self, scope: Scope, path_match: typing.Match[str]) -> Scope:
+        raise NotImplementedError()  # pragma: no cover
+
     def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
         raise NotImplementedError()  # pragma: no cover
 
     async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
         raise NotImplementedError()  # pragma: no cover
 
+    def _instrument(self, instrument: _Instrument, prefix: str) -> None:
+        """
+        Rebuild any middleware stacks within the route with timed layers.
+        """
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         A route may be used in isolation as a stand-alone ASGI app.
@@ -241,9 +339,10 @@ class Route(BaseRoute):
             # Endpoint is a class. Treat it as ASGI.
             self.app = endpoint
 
+        self._middleware = middleware
+        self._endpoint_app = self.app
         if middleware is not None:
-            for cls, args, kwargs in reversed(middleware):
-                self.app = cls(app=self.app, *args, **kwargs)
+            self.app = build_middleware_stack(self.app, middleware, ("http",))
 
         if methods is None:
             self.methods = None
@@ -253,36 +352,53 @@ class Route(BaseRoute):
                 self.methods.add("HEAD")
 
         self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+        self._path_builder = _PathBuilder(self.path_format, self.param_convertors)
 
     def matches(self, scope: Scope) -> tuple[Match, Scope]:
-        path_params: "typing.Dict[str, typing.Any]"
         if scope["type"] == "http":
-            route_path = get_route_path(scope)
-            match = self.path_regex.match(route_path)
-            if match:
-                matched_params = match.groupdict()
-                for key, value in matched_params.items():
-                    matched_params[key] = self.param_convertors[key].convert(value)
-                path_params = dict(scope.get("path_params", {}))
-                path_params.update(matched_params)
-                child_scope = {"endpoint": self.endpoint, "path_params": path_params}
-                if self.methods and scope["method"] not in self.methods:
-                    return Match.PARTIAL, child_scope
-                else:
-                    return Match.FULL, child_scope
+            match, path_match = self._match(scope, get_route_path(scope))
+            if path_match is not None:
+                return match, self._child_scope(scope, path_match)
         return Match.NONE, {}
 
-    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
-        seen_params = set(path_params.keys())
-        expected_params = set(self.param_convertors.keys())
+    def _match(
+        self, scope: Scope, route_path: str
+    ) -> tuple[Match, typing.Match[str] | None]:
+        """
+        The allocation-free part of `.matches()`, used by `Router` so that the
+        child scope only gets built for the route that handles the request.
+        """
+        if scope["type"] == "http":
+            path_match = self.path_regex.match(route_path)
+            if path_match:
+                if self.methods and scope["method"] not in self.methods:
+                    return Match.PARTIAL, path_match
+                return Match.FULL, path_match
+        return Match.NONE, None
+
+    def _child_scope(self, scope: Scope, path_match: typing.Match[str]) -> Scope:
+        matched_params = path_match.groupdict()
+        for key, value in matched_params.items():
+            matched_params[key] = self.param_convertors[key].convert(value)
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(matched_params)
+        return {"endpoint": self.endpoint, "path_params": path_params}
+
+    def _instrument(self, instrument: _Instrument, prefix: str) -> None:
+        if self._middleware is not None:
+            self.app = _instrumented_stack(
+                self._endpoint_app,
+                self._middleware,
+                ("http",),
+                f"Route({prefix + self.path!r})",
+                instrument,
+            )
 
-        if name != self.name or seen_params != expected_params:
+    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+        if name != self.name or path_params.keys() != self.param_convertors.keys():
             raise NoMatchFound(name, path_params)
 
-        path, remaining_params = replace_params(
-            self.path_format, self.param_convertors, path_params
-        )
-        assert not remaining_params
+        path = self._path_builder.build(path_params)
         return URLPath(path=path, protocol="http")
 
     async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -337,38 +453,53 @@ class WebSocketRoute(BaseRoute):
             # Endpoint is a class. Treat it as ASGI.
             self.app = endpoint
 
+        self._middleware = middleware
+        self._endpoint_app = self.app
         if middleware is not None:
-            for cls, args, kwargs in reversed(middleware):
-                self.app = cls(app=self.app, *args, **kwargs)
+            self.app = build_middleware_stack(self.app, middleware, ("websocket",))
 
         self.path_regex, self.path_format, self.param_convertors = compile_path(path)
+        self._path_builder = _PathBuilder(self.path_format, self.param_convertors)
 
     def matches(self, scope: Scope) -> tuple[Match, Scope]:
-        path_params: "typing.Dict[str, typing.Any]"
         if scope["type"] == "websocket":
-            route_path = get_route_path(scope)
-            match = self.path_regex.match(route_path)
-            if match:
-                matched_params = match.groupdict()
-                for key, value in matched_params.items():
-                    matched_params[key] = self.param_convertors[key].convert(value)
-                path_params = dict(scope.get("path_params", {}))
-                path_params.update(matched_params)
-                child_scope = {"endpoint": self.endpoint, "path_params": path_params}
-                return Match.FULL, child_scope
+            match, path_match = self._match(scope, get_route_path(scope))
+            if path_match is not None:
+                return match, self._child_scope(scope, path_match)
         return Match.NONE, {}
 
-    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
-        seen_params = set(path_params.keys())
-        expected_params = set(self.param_convertors.keys())
+    def _match(
+        self, scope: Scope, route_path: str
+    ) -> tuple[Match, typing.Match[str] | None]:
+        if scope["type"] == "websocket":
+            path_match = self.path_regex.match(route_path)
+            if path_match:
+                return Match.FULL, path_match
+        return Match.NONE, None
+
+    def _child_scope(self, scope: Scope, path_match: typing.Match[str]) -> Scope:
+        matched_params = path_match.groupdict()
+        for key, value in matched_params.items():
+            matched_params[key] = self.param_convertors[key].convert(value)
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(matched_params)
+        return {"endpoint": self.endpoint, "path_params": path_params}
+
+    def _instrument(self, instrument: _Instrument, prefix: str) -> None:
+        if self._middleware is not None:
+            self.app = _instrumented_stack(
+                self._endpoint_app,
+                self._middleware,
+                ("websocket",),
+                f"WebSocketRoute({prefix + self.path!r})",
+                instrument,
+            )
 
-        if name != self.name or seen_params != expected_params:
+    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+        if name != self.name or path_params.keys() != self.param_convertors.keys():
             raise NoMatchFound(name, path_params)
 
-        path, remaining_params = replace_params(
-            self.path_format, self.param_convertors, path_params
-        )
-        assert not remaining_params
+        path = self._path_builder.build(path_params)
         return URLPath(path=path, protocol="websocket")
 
     async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -405,58 +536,82 @@ class Mount(BaseRoute):
         else:
             self._base_app = Router(routes=routes)
         self.app = self._base_app
+        self._middleware = middleware
         if middleware is not None:
-            for cls, args, kwargs in reversed(middleware):
-                self.app = cls(app=self.app, *args, **kwargs)
+            self.app = build_middleware_stack(
+                self.app, middleware, ("http", "websocket")
+            )
         self.name = name
         self.path_regex, self.path_format, self.param_convertors = compile_path(
             self.path + "/{path:path}"
         )
+        self._path_builder = _PathBuilder(self.path_format, self.param_convertors)
 
     @property
     def routes(self) -> list[BaseRoute]:
         return getattr(self._base_app, "routes", [])
 
     def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
-        path_params: "typing.Dict[str, typing.Any]"
         if scope["type"] in ("http", "websocket"):
-            root_path = scope.get("root_path", "")
-            route_path = get_route_path(scope)
-            match = self.path_regex.match(route_path)
-            if match:
-                matched_params = match.groupdict()
-                for key, value in matched_params.items():
-                    matched_params[key] = self.param_convertors[key].convert(value)
-                remaining_path = "/" + matched_params.pop("path")
-                matched_path = route_path[: -len(remaining_path)]
-                path_params = dict(scope.get("path_params", {}))
-                path_params.update(matched_params)
-                child_scope = {
-                    "path_params": path_params,
-                    # app_root_path will only be set at the top level scope,
-                    # initialized with the (optional) value of a root_path
-                    # set above/before Starlette. And even though any
-                    # mount will have its own child scope with its own respective
-                    # root_path, the app_root_path will always be available in all
-                    # the child scopes with the same top level value because it's
-                    # set only once here with a default, any other child scope will
-                    # just inherit that app_root_path default value stored in the
-                    # scope. All this is needed to support Request.url_for(), as it
-                    # uses the app_root_path to build the URL path.
-                    "app_root_path": scope.get("app_root_path", root_path),
-                    "root_path": root_path + matched_path,
-                    "endpoint": self.app,
-                }
-                return Match.FULL, child_scope
+            match, path_match = self._match(scope, get_route_path(scope))
+            if path_match is not None:
+                return match, self._child_scope(scope, path_match)
         return Match.NONE, {}
 
+    def _match(
+        self, scope: Scope, route_path: str
+    ) -> tuple[Match, typing.Match[str] | None]:
+        if scope["type"] in ("http", "websocket"):
+            path_match = self.path_regex.match(route_path)
+            if path_match:
+                return Match.FULL, path_match
+        return Match.NONE, None
+
+    def _child_scope(self, scope: Scope, path_match: typing.Match[str]) -> Scope:
+        root_path = scope.get("root_path", "")
+        route_path = path_match.string
+        matched_params = path_match.groupdict()
+        for key, value in matched_params.items():
+            matched_params[key] = self.param_convertors[key].convert(value)
+        remaining_path = "/" + matched_params.pop("path")
+        matched_path = route_path[: -len(remaining_path)]
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(matched_params)
+        return {
+            "path_params": path_params,
+            # app_root_path will only be set at the top level scope,
+            # initialized with the (optional) value of a root_path
+            # set above/before Starlette. And even though any
+            # mount will have its own child scope with its own respective
+            # root_path, the app_root_path will always be available in all
+            # the child scopes with the same top level value because it's
+            # set only once here with a default, any other child scope will
+            # just inherit that app_root_path default value stored in the
+            # scope. All this is needed to support Request.url_for(), as it
+            # uses the app_root_path to build the URL path.
+            "app_root_path": scope.get("app_root_path", root_path),
+            "root_path": root_path + matched_path,
+            "endpoint": self.app,
+        }
+
+    def _instrument(self, instrument: _Instrument, prefix: str) -> None:
+        path = prefix + self.path
+        if isinstance(self._base_app, Router):
+            self._base_app._instrument(instrument, path)
+        if self._middleware is not None:
+            self.app = _instrumented_stack(
+                self._base_app,
+                self._middleware,
+                ("http", "websocket"),
+                f"Mount({path!r})",
+                instrument,
+            )
+
     def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
         if self.name is not None and name == self.name and "path" in path_params:
             # 'name' matches "<mount_name>".
             path_params["path"] = path_params["path"].lstrip("/")
-            path, remaining_params = replace_params(
-                self.path_format, self.param_convertors, path_params
-            )
+            path, remaining_params = self._path_builder.replace(path_params)
             if not remaining_params:
                 return URLPath(path=path)
         elif self.name is None or name.startswith(self.name + ":"):
@@ -468,12 +623,10 @@ class Mount(BaseRoute):
                 remaining_name = name[len(self.name) + 1 :]
             path_kwarg = path_params.get("path")
             path_params["path"] = ""
-            path_prefix, remaining_params = replace_params(
-                self.path_format, self.param_convertors, path_params
-            )
+            path_prefix, remaining_params = self._path_builder.replace(path_params)
             if path_kwarg is not None:
                 remaining_params["path"] = path_kwarg
-            for route in self.routes or []:
+            for route in _routes_for_name(self.routes or [], remaining_name):
                 try:
                     url = route.url_path_for(remaining_name, **remaining_params)
                     return URLPath(
@@ -506,33 +659,44 @@ class Host(BaseRoute):
         self.app = app
         self.name = name
         self.host_regex, self.host_format, self.param_convertors = compile_path(host)
+        self._host_builder = _PathBuilder(self.host_format, self.param_convertors)
 
     @property
     def routes(self) -> list[BaseRoute]:
         return getattr(self.app, "routes", [])
 
     def matches(self, scope: Scope) -> tuple[Match, Scope]:
-        if scope["type"] in ("http", "websocket"):
-            headers = Headers(scope=scope)
-            host = headers.get("host", "").split(":")[0]
-            match = self.host_regex.match(host)
-            if match:
-                matched_params = match.groupdict()
-                for key, value in matched_params.items():
-                    matched_params[key] = self.param_convertors[key].convert(value)
-                path_params = dict(scope.get("path_params", {}))
-                path_params.update(matched_params)
-                child_scope = {"path_params": path_params, "endpoint": self.app}
-                return Match.FULL, child_scope
+        match, host_match = self._match(scope, "")
+        if host_match is not None:
+            return match, self._child_scope(scope, host_match)
         return Match.NONE, {}
 
+    def _match(
+        self, scope: Scope, route_path: str
+    ) -> tuple[Match, typing.Match[str] | None]:
+        if scope["type"] in ("http", "websocket"):
+            host_match = self.host_regex.match(get_hostname(scope))
+            if host_match:
+                return Match.FULL, host_match
+        return Match.NONE, None
+
+    def _child_scope(self, scope: Scope, host_match: typing.Match[str]) -> Scope:
+        matched_params = host_match.groupdict()
+        for key, value in matched_params.items():
+            matched_params[key] = self.param_convertors[key].convert(value)
+        path_params = dict(scope.get("path_params", {}))
+        path_params.update(matched_params)
+        return {"path_params": path_params, "endpoint": self.app}
+
+    def _instrument(self, instrument: _Instrument, prefix: str) -> None:
+        if isinstance(self.app, Router):
+            self.app._instrument(instrument, prefix)
+
     def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
         if self.name is not None and name == self.name and "path" in path_params:
             # 'name' matches "<mount_name>".
             path = path_params.pop("path")
-            host, remaining_params = replace_params(
-                self.host_format, self.param_convertors, path_params
-            )
+            host, remaining_params = self._host_builder.replace(path_params)
             if not remaining_params:
                 return URLPath(path=path, host=host)
         elif self.name is None or name.startswith(self.name + ":"):
@@ -542,10 +706,8 @@ class Host(BaseRoute):
             else:
                 # 'name' matches "<mount_name>:<child_name>".
                 remaining_name = name[len(self.name) + 1 :]
-            host, remaining_params = replace_params(
-                self.host_format, self.param_convertors, path_params
-            )
-            for route in self.routes or []:
+            host, remaining_params = self._host_builder.replace(path_params)
+            for route in _routes_for_name(self.routes or [], remaining_name):
                 try:
                     url = route.url_path_for(remaining_name, **remaining_params)
                     return URLPath(path=str(url), protocol=url.protocol, host=host)
@@ -569,6 +731,520 @@ class Host(BaseRoute):
         return f"{class_name}(host={self.host!r}, name={name!r}, app={self.app!r})"
 
 
+class _RouteList(typing.List[BaseRoute]):
+    """
+    A list of routes that keeps track of modifications, so that any dispatch
+    index built from its contents can tell when it has gone stale, and which
+    can be frozen once the route table has been compiled.
+    """
+
+    version = 0
+    frozen = False
+    _name_index: _NameIndex | None = None
+
+    def _modify(self) -> None:
+        if self.frozen:
+            raise RuntimeError(
+                "Routes cannot be modified after the router has been compiled."
+            )
+        self.version += 1
+
+    def name_index(self) -> _NameIndex:
+        """
+        Return the reverse URL lookup index for these routes, building it on
+        first use, and rebuilding it if the routes have been modified since.
+        """
+        if self._name_index is None or self._name_index.version != self.version:
+            self._name_index = _NameIndex(self, self.version)
+        return self._name_index
+
+    def __setitem__(self, index: typing.Any, value: typing.Any) -> None:
+        self._modify()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index: typing.Any) -> None:
+        self._modify()
+        super().__delitem__(index)
+
+    def __iadd__(  # type: ignore[override, misc]
+        self, other: typing.Iterable[BaseRoute]
+    ) -> _RouteList:
+        self._modify()
+        super().__iadd__(other)
+        return self
+
+    def __imul__(self, count: typing.SupportsIndex) -> _RouteList:
+        self._modify()
+        super().__imul__(count)
+        return self
+
+    def append(self, route: BaseRoute) -> None:
+        self._modify()
+        super().append(route)
+
+    def extend(self, routes: typing.Iterable[BaseRoute]) -> None:
+        self._modify()
+        super().extend(routes)
+
+    def insert(self, index: typing.SupportsIndex, route: BaseRoute) -> None:
+        self._modify()
+        super().insert(index, route)
+
+    def pop(self, index: typing.SupportsIndex = -1) -> BaseRoute:
+        self._modify()
+        return super().pop(index)
+
+    def remove(self, route: BaseRoute) -> None:
+        self._modify()
+        super().remove(route)
+
+    def clear(self) -> None:
+        self._modify()
+        super().clear()
+
+    def sort(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        self._modify()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self._modify()
+        super().reverse()
+
+
+class _NameIndex:
+    """
+    Maps route names to the routes that could return a URL for them.
+
+    `Route` and `WebSocketRoute` are keyed by their name, and named `Mount` and
+    `Host` routes by their own name, which also covers "<name>:<child_name>".
+    Unnamed mounts, and routes that the index doesn't understand, are
+    candidates for every name.
+    """
+
+    def __init__(self, routes: typing.Sequence[BaseRoute], version: int) -> None:
+        self.routes = list(routes)
+        self.version = version
+        self.names: dict[str, list[int]] = {}
+        self.wildcards: list[int] = []
+        for position, route in enumerate(self.routes):
+            name: str | None
+            url_path_for = type(route).url_path_for
+            if url_path_for in (Route.url_path_for, WebSocketRoute.url_path_for):
+                name = typing.cast(typing.Union[Route, WebSocketRoute], route).name
+            elif url_path_for in (Mount.url_path_for, Host.url_path_for):
+                name = typing.cast(typing.Union[Mount, Host], route).name
+            else:
+                name = None
+            if name is None:
+                self.wildcards.append(position)
+            else:
+                self.names.setdefault(name, []).append(position)
+
+    def candidates(self, name: str) -> list[BaseRoute]:
+        positions = self.wildcards + self.names.get(name, [])
+        # A mount named "<name>" may resolve "<name>:<child_name>".
+        index = name.find(":")
+        while index != -1:
+            positions += self.names.get(name[:index], [])
+            index = name.find(":", index + 1)
+        positions.sort()
+        return [self.routes[position] for position in positions]
+
+
+def _routes_for_name(
+    routes: typing.Sequence[BaseRoute], name: str
+) -> typing.Sequence[BaseRoute]:
+    """
+    Return the routes that could return a URL for `name`, in declaration order.
+    """
+    if isinstance(routes, _RouteList):
+        return routes.name_index().candidates(name)
+    return routes
+
+
+def _static_segments(path: str) -> list[str]:
+    """
+    Return the leading path segments of a route path that contain no
+    parameters. eg. "/users/{username}/posts" -> ["users"]
+    """
+    segments = []
+    for segment in path.split("/")[1:]:
+        if "{" in segment:
+            break
+        segments.append(segment)
+    return segments
+
+
+class _IndexNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _IndexNode] = {}
+        self.positions: list[int] = []
+
+
+class _DispatchIndex:
+    """
+    Narrows down the routes of a `Router` that could match a request.
+
+    `.candidates()` returns `(route, exact)` pairs in declaration order, and
+    must include every route that could match the given path and hostname.
+    `exact` is true for parameter-free routes whose path (or host) is known to
+    equal the one of the request, which can be matched without running their
+    regex. The hostname is only given if `host_dependent` is true.
+    """
+
+    def __init__(self, routes: typing.Sequence[BaseRoute], scope_type: str) -> None:
+        self.routes = list(routes)
+        # Whether the outcome of matching depends only on the scope type, the
+        # method, the route path and (if `host_dependent`) the host header.
+        self.cacheable = all(
+            type(route).matches
+            in (Route.matches, WebSocketRoute.matches, Mount.matches, Host.matches)
+            for route in self.routes
+        )
+        self.host_dependent = any(
+            type(route).matches is Host.matches for route in self.routes
+        )
+
+    def candidates(
+        self, route_path: str, hostname: str
+    ) -> typing.Iterable[tuple[BaseRoute, bool]]:
+        raise NotImplementedError()  # pragma: no cover
+
+    def stats(self) -> dict[str, int]:
+        return {"routes": len(self.routes)}
+
+
+class _LinearIndex(_DispatchIndex):
+    """
+    Returns every route as a candidate.
+    """
+
+    def candidates(
+        self, route_path: str, hostname: str
+    ) -> typing.Iterable[tuple[BaseRoute, bool]]:
+        return [(route, False) for route in self.routes]
+
+
+class _RouteIndex(_DispatchIndex):
+    """
+    A prefix tree keyed on the static leading path segments of each route,
+    plus exact-match tables for routes that have no path parameters, and
+    `Host` routes that have no host parameters.
+
+    Routes that the index doesn't understand (eg. subclasses overriding
+    `.matches()`) are always returned as candidates.
+    """
+
+    def __init__(self, routes: typing.Sequence[BaseRoute], scope_type: str) -> None:
+        super().__init__(routes, scope_type)
+        self.root = _IndexNode()
+        self.static: dict[str, list[int]] = {}
+        self.hosts: dict[str, list[int]] = {}
+        for position, route in enumerate(self.routes):
+            if type(route).matches is Route.matches:
+                if scope_type != "http":
+                    continue
+                route = typing.cast(Route, route)
+                if not route.param_convertors:
+                    self.static.setdefault(route.path, []).append(position)
+                    continue
+                path = route.path
+            elif type(route).matches is WebSocketRoute.matches:
+                if scope_type != "websocket":
+                    continue
+                path = typing.cast(WebSocketRoute, route).path
+            elif type(route).matches is Mount.matches:
+                path = typing.cast(Mount, route).path + "/{path:path}"
+            elif type(route).matches is Host.matches:
+                route = typing.cast(Host, route)
+                if route.param_convertors:
+                    self.root.positions.append(position)
+                else:
+                    # Align with `Host.matches()` behavior, which ignores port.
+                    hostname = route.host.split(":")[0]
+                    self.hosts.setdefault(hostname, []).append(position)
+                continue
+            else:
+                self.root.positions.append(position)
+                continue
+
+            node = self.root
+            for segment in _static_segments(path):
+                node = node.children.setdefault(segment, _IndexNode())
+            node.positions.append(position)
+
+    def candidates(
+        self, route_path: str, hostname: str
+    ) -> typing.Iterable[tuple[BaseRoute, bool]]:
+        node = self.root
+        positions = [(position, False) for position in node.positions]
+        if route_path.startswith("/"):
+            for segment in route_path.split("/")[1:]:
+                child = node.children.get(segment)
+                if child is None:
+                    break
+                node = child
+                positions += [(position, False) for position in node.positions]
+        static = self.static.get(route_path)
+        if static is not None:
+            positions += [(position, True) for position in static]
+        hosts = self.hosts.get(hostname)
+        if hosts is not None:
+            positions += [(position, True) for position in hosts]
+        positions.sort()
+        return [(self.routes[position], exact) for position, exact in positions]
+
+    def stats(self) -> dict[str, int]:
+        nodes = 0
+        pending = [self.root]
+        while pending:
+            nodes += 1
+            pending += pending.pop().children.values()
+        return {
+            **super().stats(),
+            "static paths": len(self.static),
+            "hosts": len(self.hosts),
+            "prefix nodes": nodes,
+        }
+
+
+class _RegexUnionIndex(_DispatchIndex):
+    """
+    Merges the path regexes of consecutive routes into a single alternation,
+    so that one `re.match()` call finds the first route whose path matches.
+
+    Each route's regex is followed by an empty group named after its position,
+    and the winning route is read from `match.lastgroup`. Routes that can't be merged
+    (eg. `Host`) split the table into segments, with one alternation each, and
+    are returned as candidates at their position. After a partial match, the
+    following routes are returned as candidates one by one, rather than
+    compiling an alternation for every position a match could resume from.
+    """
+
+    def __init__(self, routes: typing.Sequence[BaseRoute], scope_type: str) -> None:
+        super().__init__(routes, scope_type)
+        self.alternatives = 0
+        # The alternation of the routes before each route that can't be merged,
+        # and the position of that route, or `len(self.routes)` for the last.
+        self.segments: list[tuple[typing.Pattern[str], int]] = []
+        alternatives: list[str] = []
+        for position, route in enumerate(self.routes):
+            if type(route).matches is Route.matches:
+                if scope_type != "http":
+                    continue
+                path_regex = typing.cast(Route, route).path_regex
+            elif type(route).matches is WebSocketRoute.matches:
+                if scope_type != "websocket":
+                    continue
+                path_regex = typing.cast(WebSocketRoute, route).path_regex
+            elif type(route).matches is Mount.matches:
+                path_regex = typing.cast(Mount, route).path_regex
+            else:
+                self.segments.append((_compile_union(alternatives), position))
+                alternatives = []
+                continue
+            # Strip the "^" and "$" anchors, and give the parameter groups
+            # names that are unique across all the alternatives. The group
+            # naming the route is empty and comes last, so that it's only
+            # entered once the whole path has matched: `re` saves the groups
+            # entered by each alternative it tries, which is slow with
+            # thousands of groups.
+            pattern = path_regex.pattern[1:-1].replace("(?P<", f"(?P<_{position}_")
+            alternatives.append(f"(?:{pattern})$(?P<_{position}>)")
+            self.alternatives += 1
+        self.segments.append((_compile_union(alternatives), len(self.routes)))
+
+    def candidates(
+        self, route_path: str, hostname: str
+    ) -> typing.Iterable[tuple[BaseRoute, bool]]:
+        for union, barrier in self.segments:
+            match = union.match(route_path)
+            if match is not None:
+                position = int(typing.cast(str, match.lastgroup)[1:])
+                for position in range(position, len(self.routes)):
+                    yield self.routes[position], False
+                return
+            if barrier < len(self.routes):
+                yield self.routes[barrier], False
+
+    def stats(self) -> dict[str, int]:
+        return {**super().stats(), "alternatives": self.alternatives}
+
+
+def _compile_union(alternatives: list[str]) -> typing.Pattern[str]:
+    return re.compile("|".join(alternatives) or "(?!)")
+
+
+class RouteCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _RouteCache:
+    """
+    A bounded LRU mapping from request keys to the route that was resolved
+    for them, and whether that route is a parameter-free exact match.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[
+            typing.Hashable, tuple[BaseRoute, bool]
+        ] = OrderedDict()
+
+    def get(self, key: typing.Hashable) -> tuple[BaseRoute, bool] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def set(self, key: typing.Hashable, entry: tuple[BaseRoute, bool]) -> None:
+        self.entries[key] = entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def info(self) -> RouteCacheInfo:
+        return RouteCacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+
+_DISPATCH_INDEXES: dict[str, type[_DispatchIndex]] = {
+    "prefix-tree": _RouteIndex,
+    "regex-union": _RegexUnionIndex,
+    "linear": _LinearIndex,
+}
+
+
+_LAZY_MATCHES = {Route.matches, WebSocketRoute.matches, Mount.matches, Host.matches}
+
+
+def _match_exact(route: BaseRoute, scope: Scope) -> tuple[Match, Scope]:
+    """
+    Equivalent to `route.matches(scope)` for a parameter-free `Route` or `Host`,
+    when its path or host is already known to be equal to the one of the request.
+    """
+    path_params = dict(scope.get("path_params", {}))
+    if isinstance(route, Host):
+        return Match.FULL, {"path_params": path_params, "endpoint": route.app}
+    route = typing.cast(Route, route)
+    child_scope = {"endpoint": route.endpoint, "path_params": path_params}
+    if route.methods and scope["method"] not in route.methods:
+        return Match.PARTIAL, child_scope
+    return Match.FULL, child_scope
+
+
+def _catches_all(route: BaseRoute) -> bool:
+    """
+    Return whether the `Route`, `WebSocketRoute` or `Mount` matches every path
+    that starts with a path it matches, ie. it's a `Mount` or its path ends with
+    a `{name:path}` parameter.
+    """
+    if type(route).matches is Mount.matches:
+        return True
+    route = typing.cast(typing.Union[Route, WebSocketRoute], route)
+    convertors = list(route.param_convertors.values())
+    return (
+        route.path.endswith("}")
+        and bool(convertors)
+        and isinstance(convertors[-1], PathConvertor)
+    )
+
+
+def _shadows(earlier: BaseRoute, route: BaseRoute, path: str) -> bool:
+    """
+    Return whether `earlier` matches every request that `route` could match,
+    so that `route` can never be reached. `path` is the only path that a
+    parameter-free `route` matches, or the static prefix of every path that
+    `route` matches, in which case only a catch-all `earlier` route can match
+    all of them.
+    """
+    if type(earlier).matches is Mount.matches:
+        return bool(typing.cast(Mount, earlier).path_regex.match(path))
+    if type(route).matches is Mount.matches:
+        return False
+    if type(earlier).matches is not type(route).matches:
+        return False
+    if type(route).matches is Route.matches:
+        route = typing.cast(Route, route)
+        earlier = typing.cast(Route, earlier)
+        if earlier.methods is not None and (
+            route.methods is None or not route.methods <= earlier.methods
+        ):
+            return False
+    earlier = typing.cast(typing.Union[Route, WebSocketRoute], earlier)
+    return bool(earlier.path_regex.match(path))
+
+
+def _find_route_table_problems(routes: typing.Sequence[BaseRoute]) -> list[str]:
+    """
+    Look for routes that are shadowed by an earlier route, and for names that
+    `url_path_for()` can't tell apart.
+
+    A route with parameters is only reported when an earlier `Mount`, or an
+    earlier route ending with a `{name:path}` parameter, matches every path
+    starting with its static prefix.
+    """
+    problems = []
+    indexes = {
+        scope_type: _RouteIndex(routes, scope_type)
+        for scope_type in ("http", "websocket")
+    }
+    catch_alls: list[BaseRoute] = []
+    for route in routes:
+        if type(route).matches is Route.matches:
+            index, path = indexes["http"], typing.cast(Route, route).path
+        elif type(route).matches is WebSocketRoute.matches:
+            index = indexes["websocket"]
+            path = typing.cast(WebSocketRoute, route).path
+        elif type(route).matches is Mount.matches:
+            # Every path under a mount starts with "<mount path>/".
+            index, path = indexes["http"], typing.cast(Mount, route).path + "/"
+        else:
+            continue
+        convertors = typing.cast(
+            typing.Union[Route, WebSocketRoute, Mount], route
+        ).param_convertors
+        earlier_routes: typing.Iterable[BaseRoute]
+        if convertors.keys() - ({"path"} if isinstance(route, Mount) else set()):
+            path = path.partition("{")[0]
+            earlier_routes = list(catch_alls)
+        else:
+            earlier_routes = (earlier for earlier, _ in index.candidates(path, ""))
+        if _catches_all(route):
+            catch_alls.append(route)
+        for earlier in earlier_routes:
+            if earlier is route:
+                break
+            if _shadows(earlier, route, path):
+                problems.append(f"{route!r} is shadowed by {earlier!r}.")
+                break
+
+    paths: dict[tuple[str, frozenset[str]], str] = {}
+    for route in routes:
+        if type(route).url_path_for not in (
+            Route.url_path_for,
+            WebSocketRoute.url_path_for,
+        ):
+            continue
+        route = typing.cast(typing.Union[Route, WebSocketRoute], route)
+        key = (route.name, frozenset(route.param_convertors))
+        path = paths.setdefault(key, route.path)
+        if path != route.path:
+            problems.append(
+                f"Route name {route.name!r} is used for both {path!r} and "
+                f"{route.path!r}, with the same parameters."
+            )
+    return problems
+
+
 _T = typing.TypeVar("_T")
 
 
@@ -629,8 +1305,17 @@ class Router:
         lifespan: Lifespan[typing.Any] | None = None,
         *,
         middleware: typing.Sequence[Middleware] | None = None,
+        dispatch: str = "prefix-tree",
+        route_cache_size: int = 0,
+        freeze_routes: bool = False,
     ) -> None:
-        self.routes = [] if routes is None else list(routes)
+        self._routes = _RouteList([] if routes is None else routes)
+        assert dispatch in _DISPATCH_INDEXES, f"Unknown dispatch mode '{dispatch}'"
+        self.dispatch = dispatch
+        self._indexes: dict[str, _DispatchIndex] = {}
+        self._indexed_version = -1
+        self._route_cache = _RouteCache(route_cache_size) if route_cache_size else None
+        self.freeze_routes = freeze_routes
         self.redirect_slashes = redirect_slashes
         self.default = self.not_found if default is None else default
         self.on_startup = [] if on_startup is None else list(on_startup)
@@ -674,10 +1359,88 @@ class Router:
         else:
             self.lifespan_context = lifespan
 
-        self.middleware_stack = self.app
+        self.middleware_stack: ASGIApp = self.app
+        self._middleware = middleware
         if middleware:
-            for cls, args, kwargs in reversed(middleware):
-                self.middleware_stack = cls(self.middleware_stack, *args, **kwargs)
+            self.middleware_stack = build_middleware_stack(self.app, middleware)
+
+    @property
+    def routes(self) -> list[BaseRoute]:
+        return self._routes
+
+    @routes.setter
+    def routes(self, routes: typing.Iterable[BaseRoute]) -> None:
+        if self._routes.frozen:
+            raise RuntimeError(
+                "Routes cannot be modified after the router has been compiled."
+            )
+        self._routes = _RouteList(routes)
+        # The new list starts again at version 0, so drop the indexes of the
+        # old one explicitly.
+        self._indexed_version = -1
+
+    def compile(self) -> None:
+        """
+        Validate the route table, build the dispatch indexes, and freeze the
+        routes so that they can't be modified anymore. Routers of mounted
+        applications are compiled too.
+
+        Raises `ValueError` if routes are shadowed by earlier routes, or if
+        route names are ambiguous.
+        """
+        start = time.perf_counter()
+        problems = _find_route_table_problems(self._routes)
+        if problems:
+            raise ValueError("Invalid route table:\n" + "\n".join(problems))
+
+        for route in self._routes:
+            app = getattr(route, "_base_app", getattr(route, "app", None))
+            router = getattr(app, "router", app)
+            if isinstance(router, Router):
+                router.compile()
+
+        self._routes.frozen = True
+        sizes = {
+            scope_type: self._dispatch_index(scope_type).stats()
+            for scope_type in ("http", "websocket")
+        }
+        sizes["url"] = {"names": len(self._routes.name_index().names)}
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(
+            "Compiled %d routes in %.2fms (%s)",
+            len(self._routes),
+            elapsed,
+            "; ".join(
+                f"{kind} index: "
+                + ", ".join(f"{count} {name}" for name, count in stats.items())
+                for kind, stats in sizes.items()
+            ),
+        )
+
+    def _dispatch_index(self, scope_type: str) -> _DispatchIndex:
+        """
+        Return the dispatch index for the given scope type, building it on first
+        use, and rebuilding it if the routes have been modified since.
+        """
+        if self._indexed_version != self._routes.version:
+            self._indexes = {}
+            self._indexed_version = self._routes.version
+            if self._route_cache is not None:
+                self._route_cache.entries.clear()
+        index = self._indexes.get(scope_type)
+        if index is None:
+            index_class = _DISPATCH_INDEXES[self.dispatch]
+            index = self._indexes[scope_type] = index_class(self._routes, scope_type)
+        return index
+
+    def route_cache_info(self) -> RouteCacheInfo | None:
+        """
+        Return the statistics of the route resolution cache, or `None` if the
+        router was created without a `route_cache_size`.
+        """
+        if self._route_cache is None:
+            return None
+        return self._route_cache.info()
 
     async def not_found(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] == "websocket":
@@ -694,8 +1457,20 @@ class Router:
             response = PlainTextResponse("Not Found", status_code=404)
         await response(scope, receive, send)
 
-    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+    def _instrument(self, instrument: _Instrument, prefix: str = "") -> None:
         for route in self.routes:
+            route._instrument(instrument, prefix)
+        if self._middleware:
+            self.middleware_stack = _instrumented_stack(
+                self.app,
+                self._middleware,
+                (*_SCOPE_TYPES, None),
+                f"Router({prefix!r})",
+                instrument,
+            )
+
+    def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+        for route in _routes_for_name(self.routes, name):
             try:
                 return route.url_path_for(name, **path_params)
             except NoMatchFound:
@@ -731,6 +1506,8 @@ class Router:
         app: typing.Any = scope.get("app")
         await receive()
         try:
+            if self.freeze_routes:
+                self.compile()
             async with self.lifespan_context(app) as maybe_state:
                 if maybe_state is not None:
                     if "state" not in scope:
@@ -769,44 +1546,103 @@ class Router:
 
         partial = None
 
-        for route in self.routes:
+        route_path = get_route_path(scope)
+        index = self._dispatch_index(scope["type"])
+
+        hostname = get_hostname(scope) if index.host_dependent else ""
+
+        route_cache = self._route_cache if index.cacheable else None
+        if route_cache is not None:
+            cache_key = (scope["type"], scope.get("method"), route_path, hostname)
+            cached = route_cache.get(cache_key)
+            if cached is not None:
+                # The route resolved previously for the same request key. It
+                # only needs to be matched again to build its child scope.
+                route, exact = cached
+                if exact:
+                    match, child_scope = _match_exact(route, scope)
+                else:
+                    match, path_match = route._match(scope, route_path)
+                    child_scope = route._child_scope(
+                        scope, typing.cast(typing.Match[str], path_match)
+                    )
+                scope.update(child_scope)
+                await route.handle(scope, receive, send)
+                return
+
+        for route, exact in index.candidates(route_path, hostname):
             # Determine if any route matches the incoming scope,
             # and hand over to the matching route if found.
-            match, child_scope = route.matches(scope)
+            if exact:
+                match, child_scope = _match_exact(route, scope)
+            elif type(route).matches in _LAZY_MATCHES:
+                # Built-in routes only build a child scope for the route that
+                # ends up handling the request.
+                match, path_match = route._match(scope, route_path)
+                if match == Match.NONE or (
+                    match == Match.PARTIAL and partial is not None
+                ):
+                    continue
+                child_scope = route._child_scope(
+                    scope, typing.cast(typing.Match[str], path_match)
+                )
+            else:
+                match, child_scope = route.matches(scope)
             if match == Match.FULL:
+                if route_cache is not None:
+                    route_cache.set(cache_key, (route, exact))
                 scope.update(child_scope)
                 await route.handle(scope, receive, send)
                 return
             elif match == Match.PARTIAL and partial is None:
                 partial = route
+                partial_exact = exact
                 partial_scope = child_scope
 
         if partial is not None:
-            #  Handle partial matches. These are cases where an endpoint is
+            #  Handle partial matches. These are cases where an endpoint is
             # able to handle the request, but is not a preferred option.
             # We use this in particular to deal with "405 Method Not Allowed".
+            if route_cache is not None:
+                route_cache.set(cache_key, (partial, partial_exact))
             scope.update(partial_scope)
             await partial.handle(scope, receive, send)
             return
 
-        route_path = get_route_path(scope)
         if scope["type"] == "http" and self.redirect_slashes and route_path != "/":
-            redirect_scope = dict(scope)
             if route_path.endswith("/"):
-                redirect_scope["path"] = redirect_scope["path"].rstrip("/")
+                redirect_path = scope["path"].rstrip("/")
             else:
-                redirect_scope["path"] = redirect_scope["path"] + "/"
+                redirect_path = scope["path"] + "/"
 
-            for route in self.routes:
-                match, child_scope = route.matches(redirect_scope)
-                if match != Match.NONE:
-                    redirect_url = URL(scope=redirect_scope)
-                    response = RedirectResponse(url=str(redirect_url))
-                    await response(scope, receive, send)
-                    return
+            if self._matches_any(index, scope, redirect_path, hostname):
+                redirect_url = URL(scope={**scope, "path": redirect_path})
+                response = RedirectResponse(url=str(redirect_url))
+                await response(scope, receive, send)
+                return
 
         await self.default(scope, receive, send)
 
+    def _matches_any(
+        self, index: _DispatchIndex, scope: Scope, path: str, hostname: str
+    ) -> bool:
+        """
+        Return whether any route matches the request if its path is replaced
+        with `path`. The scope is only copied for custom routes.
+        """
+        root_path = scope.get("root_path", "")
+        route_path = get_route_path({"path": path, "root_path": root_path})
+        for route, exact in index.candidates(route_path, hostname):
+            if exact:
+                return True
+            if type(route).matches in _LAZY_MATCHES:
+                match, _ = route._match(scope, route_path)
+            else:
+                match, _ = route.matches({**scope, "path": path})
+            if match != Match.NONE:
+                return True
+        return False
+
     def __eq__(self, other: typing.Any) -> bool:
         return isinstance(other, Router) and self.routes == other.routes
 
@@ -6,10 +6,8 @@ import stat
 import typing
 from email.utils import parsedate
 
-import anyio
-import anyio.to_thread
-
-from starlette._utils import get_route_path
+from starlette._utils import get_headers, get_route_path
+from starlette.concurrency import get_thread_limiter
 from starlette.datastructures import URL, Headers
 from starlette.exceptions import HTTPException
 from starlette.responses import FileResponse, RedirectResponse, Response
@@ -119,7 +117,7 @@ class StaticFiles:
             raise HTTPException(status_code=405)
 
         try:
-            full_path, stat_result = await anyio.to_thread.run_sync(
+            full_path, stat_result = await get_thread_limiter("file-io").run(
                 self.lookup_path, path
             )
         except PermissionError:
@@ -135,7 +133,7 @@ class StaticFiles:
             # We're in HTML mode, and have got a directory URL.
             # Check if we have 'index.html' file to serve.
             index_path = os.path.join(path, "index.html")
-            full_path, stat_result = await anyio.to_thread.run_sync(
+            full_path, stat_result = await get_thread_limiter("file-io").run(
                 self.lookup_path, index_path
             )
             if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
@@ -148,7 +146,7 @@ class StaticFiles:
 
         if self.html:
             # Check for '404.html' if we're in HTML mode.
-            full_path, stat_result = await anyio.to_thread.run_sync(
+            full_path, stat_result = await get_thread_limiter("file-io").run(
                 self.lookup_path, "404.html"
             )
             if stat_result and stat.S_ISREG(stat_result.st_mode):
@@ -180,7 +178,7 @@ class StaticFiles:
         scope: Scope,
         status_code: int = 200,
     ) -> Response:
-        request_headers = Headers(scope=scope)
+        request_headers = get_headers(scope)
 
         response = FileResponse(
             full_path, status_code=status_code, stat_result=stat_result
@@ -199,7 +197,9 @@ class StaticFiles:
             return
 
         try:
-            stat_result = await anyio.to_thread.run_sync(os.stat, self.directory)
+            stat_result = await get_thread_limiter("file-io").run(
+                os.stat, self.directory
+            )
         except FileNotFoundError:
             raise RuntimeError(
                 f"StaticFiles directory '{self.directory}' does not exist."
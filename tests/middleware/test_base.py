@@ -912,3 +912,116 @@ def test_pr_1519_comment_1236166180_example() -> None:
     resp.raise_for_status()
 
     assert bodies == [b"Hello, World!-foo"]
+
+
+def test_passthrough_body(
+    test_client_factory: Callable[[ASGIApp], TestClient],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def restreamed(*args: Any) -> None:  # pragma: no cover
+        raise AssertionError("The response body should not be re-streamed.")
+
+    monkeypatch.setattr(StreamingResponse, "__call__", restreamed)
+    background_ran = False
+
+    def set_background_ran() -> None:
+        nonlocal background_ran
+        background_ran = True
+
+    async def dispatch(request: Request, call_next: RequestResponseEndpoint) -> Any:
+        response = await call_next(request)
+        response.headers["Custom-Header"] = "Example"
+        response.status_code = 201
+        response.background = BackgroundTask(set_background_ran)
+        return response
+
+    app = Starlette(
+        routes=[
+            Route("/", endpoint=homepage),
+            Route("/exc", endpoint=exc),
+            Route("/no-response", endpoint=NoResponse),
+        ],
+        middleware=[
+            Middleware(BaseHTTPMiddleware, dispatch=dispatch, passthrough_body=True),
+            Middleware(BaseHTTPMiddleware, dispatch=dispatch, passthrough_body=True),
+        ],
+    )
+    client = test_client_factory(app)
+
+    response = client.get("/")
+    assert response.status_code == 201
+    assert response.text == "Homepage"
+    assert response.headers["Custom-Header"] == "Example"
+    assert background_ran
+
+    with pytest.raises(Exception, match="Exc"):
+        client.get("/exc")
+    with pytest.raises(RuntimeError):
+        client.get("/no-response")
+
+
+def test_passthrough_body_streaming(
+    test_client_factory: Callable[[ASGIApp], TestClient],
+) -> None:
+    async def dispatch(request: Request, call_next: RequestResponseEndpoint) -> Any:
+        response = await call_next(request)
+        response.headers["Custom-Header"] = "Example"
+        return response
+
+    app = Starlette(
+        routes=[Route("/exc-stream", endpoint=exc_stream)],
+        middleware=[
+            Middleware(BaseHTTPMiddleware, dispatch=dispatch, passthrough_body=True)
+        ],
+    )
+    client = test_client_factory(app)
+    with pytest.raises(Exception, match="Faulty Stream"):
+        client.get("/exc-stream")
+
+    async def debug_app(scope: Scope, receive: Receive, send: Send) -> None:
+        info = {"template": "x", "context": {}}
+        await send({"type": "http.response.debug", "info": info})
+        await StreamingResponse(iter([b"a", b"b"]))(scope, receive, send)
+
+    middleware = BaseHTTPMiddleware(debug_app, dispatch=dispatch, passthrough_body=True)
+    response = test_client_factory(middleware).get("/")
+    assert response.text == "ab"
+    assert response.headers["Custom-Header"] == "Example"
+    assert response.template == "x"  # type: ignore[attr-defined]
+
+
+def test_passthrough_body_falls_back_when_body_is_read(
+    test_client_factory: Callable[[ASGIApp], TestClient],
+) -> None:
+    async def wrap_body(
+        request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        response = await call_next(request)
+        assert isinstance(response, StreamingResponse)
+        body = response.body_iterator
+
+        async def upper() -> AsyncGenerator[Union[str, bytes], None]:
+            async for chunk in body:
+                yield chunk.upper()
+
+        response.body_iterator = upper()
+        return response
+
+    async def read_first_chunk(
+        request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        response = await call_next(request)
+        assert isinstance(response, StreamingResponse)
+        first = await response.body_iterator.__aiter__().__anext__()
+        assert first == b"Homepage"
+        return response
+
+    for dispatch, expected in [(wrap_body, "HOMEPAGE"), (read_first_chunk, "")]:
+        app = Starlette(
+            routes=[Route("/", endpoint=homepage)],
+            middleware=[
+                Middleware(BaseHTTPMiddleware, dispatch=dispatch, passthrough_body=True)
+            ],
+        )
+        response = test_client_factory(app).get("/")
+        assert response.text == expected
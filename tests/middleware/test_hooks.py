@@ -0,0 +1,94 @@
+from typing import Callable, Optional
+
+import pytest
+
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.middleware import Middleware
+from starlette.middleware.hooks import HookMiddleware
+from starlette.requests import HTTPConnection, Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.websockets import WebSocket, WebSocketClose, WebSocketDisconnect
+
+TestClientFactory = Callable[[ASGIApp], TestClient]
+
+
+class RequestIDMiddleware(HookMiddleware):
+    async def before_request(self, conn: HTTPConnection) -> Optional[ASGIApp]:
+        if "x-forbidden" in conn.headers:
+            if conn.scope["type"] == "websocket":
+                return WebSocketClose()
+            return PlainTextResponse("Forbidden", status_code=403)
+        conn.state.request_id = conn.headers.get("x-request-id", "generated")
+        return None
+
+    async def on_response_start(self, conn: HTTPConnection, message: Message) -> None:
+        headers = MutableHeaders(scope=message)
+        headers["X-Request-ID"] = conn.state.request_id
+
+
+def homepage(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(f"Hello, {request.state.request_id}")
+
+
+def stream(request: Request) -> StreamingResponse:
+    return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+
+async def websocket_endpoint(websocket: WebSocket) -> None:
+    await websocket.accept()
+    await websocket.send_text(websocket.state.request_id)
+    await websocket.close()
+
+
+app = Starlette(
+    routes=[
+        Route("/", endpoint=homepage),
+        Route("/stream", endpoint=stream),
+        WebSocketRoute("/ws", endpoint=websocket_endpoint),
+    ],
+    middleware=[Middleware(RequestIDMiddleware)],
+)
+
+
+def test_hooks_http(test_client_factory: TestClientFactory) -> None:
+    with test_client_factory(app) as client:
+        response = client.get("/", headers={"X-Request-ID": "abc"})
+        assert response.text == "Hello, abc"
+        assert response.headers["X-Request-ID"] == "abc"
+
+        response = client.get("/stream")
+        assert response.text == "abc"
+        assert response.headers["X-Request-ID"] == "generated"
+
+        response = client.get("/", headers={"X-Forbidden": "1"})
+        assert response.status_code == 403
+        assert "X-Request-ID" not in response.headers
+
+
+def test_hooks_websocket(test_client_factory: TestClientFactory) -> None:
+    client = test_client_factory(app)
+    with client.websocket_connect("/ws", headers={"X-Request-ID": "abc"}) as session:
+        assert session.receive_text() == "abc"
+        assert session.extra_headers == [(b"x-request-id", b"abc")]
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/ws", headers={"X-Forbidden": "1"}):
+            pass  # pragma: no cover
+
+
+def test_hooks_default_to_passthrough(test_client_factory: TestClientFactory) -> None:
+    sent = []
+
+    async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+        sent.append(send)
+        await PlainTextResponse("Hello")(scope, receive, send)
+
+    middleware = HookMiddleware(endpoint)
+    response = test_client_factory(middleware).get("/")
+    assert response.text == "Hello"
+    # Without an `on_response_start` hook, `send` is passed through unchanged.
+    assert "send_wrapper" not in sent[0].__qualname__
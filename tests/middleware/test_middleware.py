@@ -1,5 +1,7 @@
-from starlette.middleware import Middleware
-from starlette.types import ASGIApp, Receive, Scope, Send
+import anyio
+
+from starlette.middleware import Middleware, build_middleware_stack
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class CustomMiddleware:  # pragma: no cover
@@ -20,3 +22,67 @@ def test_middleware_repr() -> None:
 def test_middleware_iter() -> None:
     cls, args, kwargs = Middleware(CustomMiddleware, "foo", bar=123)
     assert (cls, args, kwargs) == (CustomMiddleware, ("foo",), {"bar": 123})
+
+
+class HTTPOnlyMiddleware:
+    scope_types = ("http",)
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope.setdefault("seen", []).append("http-only")
+        await self.app(scope, receive, send)
+
+
+class AnyScopeMiddleware(HTTPOnlyMiddleware):
+    # Overrides `__call__` without declaring its scope types, so it is never
+    # skipped.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope.setdefault("seen", []).append("any")
+        await self.app(scope, receive, send)
+
+
+class LoggingHTTPOnlyMiddleware(HTTPOnlyMiddleware):
+    pass
+
+
+def test_build_middleware_stack_skips_layers() -> None:
+    seen = {}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen[scope["type"]] = scope.get("seen", [])
+
+    stack = build_middleware_stack(
+        app,
+        [
+            Middleware(HTTPOnlyMiddleware),
+            Middleware(AnyScopeMiddleware),
+            Middleware(LoggingHTTPOnlyMiddleware),
+        ],
+    )
+
+    async def receive() -> Message:
+        raise NotImplementedError()  # pragma: no cover
+
+    async def send(message: Message) -> None:
+        raise NotImplementedError()  # pragma: no cover
+
+    for scope_type in ("http", "websocket", "lifespan", "custom"):
+        anyio.run(stack, {"type": scope_type}, receive, send)
+    assert seen == {
+        "http": ["http-only", "any", "http-only"],
+        "websocket": ["any"],
+        "lifespan": ["any"],
+        "custom": ["any"],
+    }
+
+
+def test_build_middleware_stack_without_applicable_layers() -> None:
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        pass  # pragma: no cover
+
+    stack = build_middleware_stack(
+        app, [Middleware(HTTPOnlyMiddleware)], scope_types=("websocket",)
+    )
+    assert stack is app
@@ -0,0 +1,163 @@
+import time
+from typing import Callable, List, Tuple
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.middleware.timing import (
+    MiddlewareTimingCollector,
+    MiddlewareTimingHistogram,
+    TimedLayer,
+)
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Host, Mount, Route, Router, WebSocketRoute
+from starlette.testclient import TestClient
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.websockets import WebSocket
+
+TestClientFactory = Callable[[ASGIApp], TestClient]
+
+
+class SlowMiddleware:
+    def __init__(self, app: ASGIApp, before: float = 0.0, after: float = 0.0) -> None:
+        self.app = app
+        self.before = before
+        self.after = after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async def send_wrapper(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.start":
+                time.sleep(self.after)
+
+        time.sleep(self.before)
+        await self.app(scope, receive, send_wrapper)
+
+
+class ListCollector(MiddlewareTimingCollector):
+    def __init__(self) -> None:
+        self.records: List[Tuple[str, float, float]] = []
+
+    def record(self, layer: str, before_start: float, after_start: float) -> None:
+        self.records.append((layer, before_start, after_start))
+
+
+def homepage(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("Homepage")
+
+
+async def websocket_endpoint(websocket: WebSocket) -> None:
+    await websocket.accept()
+    await websocket.close()
+
+
+def test_timings_are_attributed_to_each_layer(
+    test_client_factory: TestClientFactory,
+) -> None:
+    collector = ListCollector()
+    app = Starlette(
+        routes=[
+            Route(
+                "/",
+                endpoint=homepage,
+                middleware=[Middleware(SlowMiddleware, before=0.02)],
+            )
+        ],
+        middleware=[Middleware(SlowMiddleware, after=0.02)],
+        instrument_middleware=collector,
+    )
+    assert app.state.middleware_timings is collector
+
+    assert test_client_factory(app).get("/").text == "Homepage"
+    layers = [layer for layer, _, _ in collector.records]
+    assert layers == [
+        "ServerErrorMiddleware",
+        "SlowMiddleware",
+        "ExceptionMiddleware",
+        "Router",
+        "Route('/') SlowMiddleware",
+        "Route('/')",
+    ]
+    timings = {layer: (before, after) for layer, before, after in collector.records}
+    assert timings["SlowMiddleware"][0] < 0.02 <= timings["SlowMiddleware"][1]
+    route_timings = timings["Route('/') SlowMiddleware"]
+    assert route_timings[0] >= 0.02 > route_timings[1]
+    assert timings["Router"][0] < 0.02
+    assert timings["ServerErrorMiddleware"][1] < 0.02
+
+
+def test_timings_histogram(test_client_factory: TestClientFactory) -> None:
+    def inner() -> Router:
+        return Router(
+            routes=[
+                Route("/", endpoint=homepage, middleware=[Middleware(GZipMiddleware)]),
+                WebSocketRoute(
+                    "/ws",
+                    endpoint=websocket_endpoint,
+                    middleware=[Middleware(SlowMiddleware)],
+                ),
+            ],
+            middleware=[Middleware(SlowMiddleware)],
+        )
+
+    app = Starlette(
+        routes=[
+            Mount("/mount", routes=[Mount("/inner", app=inner())]),
+            Host(
+                "example.org",
+                app=Router(routes=[Route("/", endpoint=homepage)]),
+            ),
+            Mount("/other", app=inner(), middleware=[Middleware(SlowMiddleware)]),
+        ],
+        instrument_middleware=True,
+    )
+    histogram = app.state.middleware_timings
+    assert isinstance(histogram, MiddlewareTimingHistogram)
+
+    with test_client_factory(app) as client:
+        assert client.get("/mount/inner/").text == "Homepage"
+        assert client.get("/other/").text == "Homepage"
+        with client.websocket_connect("/mount/inner/ws"):
+            pass
+
+    assert {
+        layer: histograms["before_start"].count
+        for layer, histograms in histogram.layers.items()
+    } == {
+        "ServerErrorMiddleware": 2,
+        "ExceptionMiddleware": 3,
+        "Router": 3,
+        "Mount('/other')": 1,
+        "Mount('/other') SlowMiddleware": 1,
+        "Router('/other')": 1,
+        "Router('/other') SlowMiddleware": 1,
+        "Route('/other/')": 1,
+        "Route('/other/') GZipMiddleware": 1,
+        "Router('/mount/inner')": 2,
+        "Router('/mount/inner') SlowMiddleware": 2,
+        "Route('/mount/inner/')": 1,
+        "Route('/mount/inner/') GZipMiddleware": 1,
+        "WebSocketRoute('/mount/inner/ws')": 1,
+        "WebSocketRoute('/mount/inner/ws') SlowMiddleware": 1,
+    }
+    websocket = histogram.layers["WebSocketRoute('/mount/inner/ws') SlowMiddleware"]
+    assert websocket["after_start"].sum == 0.0
+    router = histogram.layers["Router"]["before_start"]
+    assert sum(router.counts) == router.count == 3
+    assert repr(router) == f"TimingHistogram(count=3, sum={router.sum!r})"
+
+
+def test_timings_disabled() -> None:
+    app = Starlette(middleware=[Middleware(SlowMiddleware)])
+    assert app.middleware_timings is None
+    assert not hasattr(app.state, "middleware_timings")
+    chain = app.middleware_chain("http")
+    assert not any(isinstance(layer, TimedLayer) for layer in chain)
+
+    app = Starlette(middleware=[Middleware(SlowMiddleware)], instrument_middleware=True)
+    assert [type(layer).__name__ for layer in app.middleware_chain("http")] == [
+        "ServerErrorMiddleware",
+        "SlowMiddleware",
+        "ExceptionMiddleware",
+    ]
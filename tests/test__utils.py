@@ -1,6 +1,8 @@
 import functools
 
-from starlette._utils import is_async_callable
+from starlette._utils import get_headers, is_async_callable
+from starlette.requests import HTTPConnection
+from starlette.types import Scope
 
 
 def test_async_func():
@@ -77,3 +79,16 @@ def test_async_nested_partial():
     partial = functools.partial(async_func, b=2)
     nested_partial = functools.partial(partial, a=1)
     assert is_async_callable(nested_partial)
+
+
+def test_get_headers_is_cached_in_scope() -> None:
+    scope: Scope = {"type": "http", "headers": ((b"host", b"example.org"),)}
+    headers = get_headers(scope)
+    assert headers["host"] == "example.org"
+    assert isinstance(scope["headers"], list)
+    assert get_headers(scope) is headers
+    assert HTTPConnection(scope).headers is headers
+
+    scope["headers"] = [(b"host", b"example.com")]
+    assert get_headers(scope) is not headers
+    assert get_headers(scope)["host"] == "example.com"
@@ -1,6 +1,6 @@
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Callable
+from typing import AsyncIterator, Callable, List
 
 import anyio
 import httpx
@@ -11,6 +11,7 @@ from starlette.applications import Starlette
 from starlette.endpoints import HTTPEndpoint
 from starlette.exceptions import HTTPException, WebSocketException
 from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.routing import Host, Mount, Route, Router, WebSocketRoute
@@ -548,3 +549,24 @@ def test_lifespan_app_subclass():
         yield
 
     App(lifespan=lifespan)
+
+
+def test_middleware_chain() -> None:
+    app = Starlette(
+        middleware=[
+            Middleware(CORSMiddleware, allow_origins=["*"]),
+            Middleware(TrustedHostMiddleware, allowed_hosts=["testserver"]),
+        ]
+    )
+
+    def chain(scope_type: str) -> List[str]:
+        return [type(layer).__name__ for layer in app.middleware_chain(scope_type)]
+
+    assert chain("http") == [
+        "ServerErrorMiddleware",
+        "CORSMiddleware",
+        "TrustedHostMiddleware",
+        "ExceptionMiddleware",
+    ]
+    assert chain("websocket") == ["TrustedHostMiddleware", "ExceptionMiddleware"]
+    assert chain("lifespan") == []
@@ -1,12 +1,25 @@
+import threading
+import typing
 from contextvars import ContextVar
 
 import anyio
+import anyio.to_thread
 import pytest
 
+from starlette import concurrency
 from starlette.applications import Starlette
-from starlette.concurrency import iterate_in_threadpool, run_until_first_complete
+from starlette.background import BackgroundTask
+from starlette.concurrency import (
+    ThreadLimiter,
+    configure_thread_limiter,
+    get_thread_limiter,
+    iterate_in_threadpool,
+    iterate_in_threadpool_batched,
+    run_in_threadpool,
+    run_until_first_complete,
+)
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response
 from starlette.routing import Route
 
 
@@ -49,3 +62,299 @@ async def test_iterate_in_threadpool() -> None:
             yield from range(3)
 
     assert [v async for v in iterate_in_threadpool(CustomIterable())] == [0, 1, 2]
+
+
+@pytest.mark.anyio
+async def test_iterate_in_threadpool_batched() -> None:
+    log: typing.List[str] = []
+
+    def produce():
+        for i in range(5):
+            log.append(f"produce {i}")
+            yield i
+
+    async for i in iterate_in_threadpool_batched(produce(), max_items=2):
+        log.append(f"consume {i}")
+
+    assert log == [
+        "produce 0",
+        "produce 1",
+        "consume 0",
+        "consume 1",
+        "produce 2",
+        "produce 3",
+        "consume 2",
+        "consume 3",
+        "produce 4",
+        "consume 4",
+    ]
+
+
+@pytest.mark.anyio
+async def test_iterate_in_threadpool_batched_limits() -> None:
+    log: typing.List[str] = []
+
+    def produce():
+        for item in [b"ab", b"cd", b"e", b"", b"fgh", b"ijk", None, None]:
+            log.append("produce")
+            yield item
+
+    # Batches end once they add up to 4 bytes, or after an empty chunk. Other
+    # items don't count towards max_bytes.
+    async for _ in iterate_in_threadpool_batched(
+        produce(), max_items=None, max_bytes=4
+    ):
+        log.append("consume")
+    assert "".join(entry[0] for entry in log) == "ppccppccppccppcc"
+
+    log.clear()
+    async for _ in iterate_in_threadpool_batched(range(3), max_wait=0):
+        log.append("consume")
+    assert log == ["consume"] * 3
+
+    with pytest.raises(AssertionError):
+        async for _ in iterate_in_threadpool_batched(range(3), max_items=None):
+            pass  # pragma: no cover
+
+
+@pytest.mark.anyio
+async def test_iterate_in_threadpool_batched_exception() -> None:
+    def produce():
+        yield 1
+        yield 2
+        raise ValueError()
+
+    items = []
+    with pytest.raises(ValueError):
+        async for item in iterate_in_threadpool_batched(produce()):
+            items.append(item)
+    assert items == [1, 2]
+
+    with pytest.raises(ValueError):
+        async for _ in iterate_in_threadpool_batched(produce(), max_items=2):
+            pass
+
+
+@pytest.mark.anyio
+async def test_run_in_threadpool() -> None:
+    assert await run_in_threadpool(threading.get_ident) != threading.get_ident()
+
+
+@pytest.mark.anyio
+async def test_thread_limiter_statistics() -> None:
+    limiter = ThreadLimiter("test", total_tokens=1)
+    release = threading.Event()
+
+    def block(value: int) -> int:
+        release.wait()
+        return value
+
+    results: typing.List[int] = []
+
+    async def run(value: int) -> None:
+        results.append(await limiter.run(block, value=value))
+
+    async with anyio.create_task_group() as task_group:
+        try:
+            task_group.start_soon(run, 1)
+            task_group.start_soon(run, 2)
+            # Wait for one call to hold the only token and the other to queue.
+            with anyio.fail_after(5):
+                statistics = limiter.statistics()
+                while statistics.active_threads < 1 or statistics.queue_depth < 1:
+                    await anyio.sleep(0.001)
+                    statistics = limiter.statistics()
+            assert statistics.total_tokens == 1
+            assert statistics.active_threads == 1
+            assert statistics.queue_depth == 1
+            assert statistics.calls == 1
+            await anyio.sleep(0.01)
+        finally:
+            release.set()
+
+    assert sorted(results) == [1, 2]
+    statistics = limiter.statistics()
+    assert statistics.active_threads == 0
+    assert statistics.queue_depth == 0
+    assert statistics.calls == 2
+    assert statistics.max_wait_time >= 0.01
+    assert statistics.total_wait_time >= statistics.max_wait_time
+
+
+@pytest.mark.anyio
+async def test_thread_limiter_total_tokens() -> None:
+    limiter = ThreadLimiter("test")
+    default_limiter = anyio.to_thread.current_default_thread_limiter()
+    assert limiter.capacity_limiter is default_limiter
+    assert limiter.statistics().total_tokens == default_limiter.total_tokens
+
+    limiter.total_tokens = 2
+    capacity_limiter = limiter.capacity_limiter
+    assert capacity_limiter is not default_limiter
+    assert capacity_limiter.total_tokens == 2
+    assert limiter.capacity_limiter is capacity_limiter
+
+    limiter.total_tokens = 3
+    assert limiter.capacity_limiter is capacity_limiter
+    assert capacity_limiter.total_tokens == 3
+    assert ThreadLimiter("other", 3).capacity_limiter is not capacity_limiter
+
+
+@pytest.mark.anyio
+async def test_thread_limiter_statistics_count_own_calls() -> None:
+    limiter = ThreadLimiter("test")
+    release = threading.Event()
+
+    def block() -> None:
+        release.wait()
+
+    async with anyio.create_task_group() as task_group:
+        try:
+            # Other work holding threads of anyio's default limiter.
+            task_group.start_soon(anyio.to_thread.run_sync, block)
+            task_group.start_soon(anyio.to_thread.run_sync, block)
+            task_group.start_soon(limiter.run, block)
+            with anyio.fail_after(5):
+                while limiter.statistics().active_threads < 1:
+                    await anyio.sleep(0.001)
+            statistics = limiter.statistics()
+            assert statistics.active_threads == 1
+            assert statistics.queue_depth == 0
+            assert statistics.calls == 1
+        finally:
+            release.set()
+
+    assert limiter.statistics().active_threads == 0
+
+
+@pytest.mark.anyio
+async def test_thread_limiter_statistics_cancelled_while_queued() -> None:
+    limiter = ThreadLimiter("test", total_tokens=1)
+    release = threading.Event()
+
+    def block() -> None:
+        release.wait()
+
+    async with anyio.create_task_group() as task_group:
+        try:
+            task_group.start_soon(limiter.run, block)
+            with anyio.fail_after(5):
+                while limiter.statistics().active_threads < 1:
+                    await anyio.sleep(0.001)
+            async with anyio.create_task_group() as queued:
+                queued.start_soon(limiter.run, block)
+                # Wait until the call is blocked on the token the first holds.
+                with anyio.fail_after(5):
+                    while limiter.capacity_limiter.statistics().tasks_waiting < 1:
+                        await anyio.sleep(0.001)
+                assert limiter.statistics().queue_depth == 1
+                queued.cancel_scope.cancel()
+            assert limiter.statistics().queue_depth == 0
+        finally:
+            release.set()
+
+    statistics = limiter.statistics()
+    assert statistics.calls == 1
+    assert statistics.active_threads == 0
+
+
+def test_thread_limiter_statistics_per_event_loop() -> None:
+    limiter = ThreadLimiter("test", total_tokens=1)
+
+    async def run() -> int:
+        await limiter.run(lambda: None)
+        return limiter.statistics().calls
+
+    assert anyio.run(run) == 1
+    assert anyio.run(run) == 1
+
+
+def test_configure_thread_limiter(monkeypatch) -> None:
+    monkeypatch.setattr(concurrency, "_thread_limiters", {})
+    with pytest.raises(AssertionError):
+        get_thread_limiter("reports")
+
+    limiter = configure_thread_limiter("reports", 4)
+    assert get_thread_limiter("reports") is limiter
+    assert limiter.total_tokens == 4
+    assert configure_thread_limiter("reports", None) is limiter
+    assert limiter.total_tokens is None
+
+
+def test_app_thread_limiters(test_client_factory) -> None:
+    async def endpoint(request: Request) -> Response:
+        limiter = get_thread_limiter("reports")
+        return PlainTextResponse(str(limiter.total_tokens))
+
+    app = Starlette(
+        routes=[Route("/", endpoint)], thread_limiters={"reports": 2, "file-io": 3}
+    )
+    other = Starlette(routes=[Route("/", endpoint)], thread_limiters={"reports": 4})
+    assert test_client_factory(app).get("/").text == "2"
+    assert test_client_factory(other).get("/").text == "4"
+
+    # Configuring an application leaves the process-wide limiters alone.
+    with pytest.raises(AssertionError):
+        get_thread_limiter("reports")
+    assert get_thread_limiter("file-io").total_tokens is None
+
+
+def test_thread_limiters_by_workload(test_client_factory, tmp_path):
+    def background() -> None:
+        pass
+
+    def sync_endpoint(request: Request) -> Response:
+        return PlainTextResponse("sync", background=BackgroundTask(background))
+
+    path = tmp_path / "example.txt"
+    path.write_bytes(b"file")
+
+    async def file(request: Request) -> Response:
+        return FileResponse(path)
+
+    async def calls(request: Request) -> Response:
+        return JSONResponse(
+            {
+                name: get_thread_limiter(name).statistics().calls
+                for name in ("endpoints", "file-io", "background")
+            }
+        )
+
+    app = Starlette(
+        routes=[
+            Route("/sync", sync_endpoint),
+            Route("/file", file),
+            Route("/calls", calls),
+        ],
+        thread_limiters={"endpoints": 2, "file-io": 1, "background": 1},
+    )
+    with test_client_factory(app) as client:
+        assert client.get("/sync").text == "sync"
+        assert client.get("/calls").json() == {
+            "endpoints": 1,
+            "file-io": 0,
+            "background": 1,
+        }
+
+        assert client.get("/file").text == "file"
+        # Stat-ing, opening, reading and closing the file.
+        assert client.get("/calls").json() == {
+            "endpoints": 1,
+            "file-io": 4,
+            "background": 1,
+        }
+
+
+@pytest.mark.anyio
+async def test_iterate_in_threadpool_limiter() -> None:
+    limiter = ThreadLimiter("test", total_tokens=1)
+    assert [v async for v in iterate_in_threadpool(range(3), limiter=limiter)] == [
+        0,
+        1,
+        2,
+    ]
+    assert limiter.statistics().calls == 4
+
+    items = iterate_in_threadpool_batched(range(3), max_items=2, limiter=limiter)
+    assert [v async for v in items] == [0, 1, 2]
+    assert limiter.statistics().calls == 6
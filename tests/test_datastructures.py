@@ -1,6 +1,7 @@
 import io
 from tempfile import SpooledTemporaryFile
 from typing import BinaryIO
+from urllib.parse import urlsplit
 
 import pytest
 
@@ -12,7 +13,9 @@ from starlette.datastructures import (
     MultiDict,
     MutableHeaders,
     QueryParams,
+    State,
     UploadFile,
+    URLPath,
 )
 
 
@@ -139,6 +142,50 @@ def test_url_from_scope():
     assert repr(u) == "URL('https://example.org/path/to/somewhere?abc=123')"
 
 
+@pytest.mark.parametrize(
+    "host, server, path, query_string",
+    [
+        ("example.org", None, "/path", b"a=1"),
+        (None, ("example.org", 8000), "", b"a=1"),
+        (None, None, "/path", b""),
+        (None, None, "//path", b""),
+        ("", None, "/path", b""),
+        ("[::1]:8000", None, "/path", b""),
+        ("example.org", None, "/path?with#delimiters", b"a=1#2"),
+        ("example.org", None, "relative", b""),
+        ("exämple.org", None, "/path", b""),
+    ],
+)
+def test_url_from_scope_components(host, server, path, query_string):
+    headers = [] if host is None else [(b"host", host.encode("latin-1"))]
+    scope = {
+        "scheme": "http",
+        "server": server,
+        "path": path,
+        "query_string": query_string,
+        "headers": headers,
+    }
+    url = URL(scope=scope)
+    assert url.components == urlsplit(str(url))
+
+
+@pytest.mark.parametrize(
+    "base_url, path",
+    [
+        ("https://example.org/root/", "/path"),
+        ("https://example.org", "/path?with#delimiters"),
+        ("/root/", "/path"),
+    ],
+)
+def test_url_path_make_absolute_url(base_url, path):
+    url = URLPath(path).make_absolute_url(base_url)
+    base = URL(base_url)
+    assert url == URL(
+        scheme=base.scheme, netloc=base.netloc, path=base.path.rstrip("/") + path
+    )
+    assert url.components == urlsplit(str(url))
+
+
 def test_headers():
     h = Headers(raw=[(b"a", b"123"), (b"a", b"456"), (b"b", b"789")])
     assert "a" in h
@@ -244,6 +291,111 @@ def test_mutable_headers_from_scope():
     assert list(h.raw) == [(b"a", b"1"), (b"b", b"2")]
 
 
+def test_mutable_headers_index_is_kept_consistent():
+    padding = [(f"x-{i}".encode(), b"") for i in range(8)]
+    raw = [(b"a", b"1"), (b"b", b"2"), (b"a", b"3"), *padding]
+    h = Headers(raw=raw).mutablecopy()
+    # The first lookup scans the list, and later ones use the index.
+    assert h.getlist("a") == ["1", "3"]
+    assert h.getlist("a") == ["1", "3"]
+    h.append("c", "4")
+    h.append("a", "5")
+    assert h.getlist("a") == ["1", "3", "5"]
+    assert h["c"] == "4"
+    h["a"] = "6"
+    # `raw` would hand out the list and stop the indexing, so compare items.
+    assert (
+        h.items()
+        == Headers(raw=[(b"a", b"6"), (b"b", b"2"), *padding, (b"c", b"4")]).items()
+    )
+    assert h["c"] == "4"
+    assert h.setdefault("d", "7") == "7"
+    assert h.setdefault("d", "8") == "7"
+    del h["d"]
+    del h["b"]
+    del h["missing"]
+    assert h.items() == [
+        ("a", "6"),
+        *((k.decode(), "") for k, _ in padding),
+        ("c", "4"),
+    ]
+    assert "b" not in h
+    assert "d" not in h
+    assert h.getlist("c") == ["4"]
+    with pytest.raises(KeyError):
+        h["d"]
+
+
+def test_headers_index_follows_shared_list():
+    raw = [(b"a", b"1"), (b"b", b"2"), *((f"x-{i}".encode(), b"") for i in range(8))]
+    h = Headers(raw=raw)
+    assert h["b"] == "2"
+    assert h["b"] == "2"
+
+    # Changes made through another instance sharing the same list.
+    other = MutableHeaders(raw=raw)
+    other.append("c", "3")
+    assert h["c"] == "3"
+    # Removing and adding a header leaves the size unchanged.
+    del other["a"]
+    other.append("a", "4")
+    assert h["a"] == "4"
+    assert h["b"] == "2"
+    assert "d" not in h
+
+    # A new key added while the size stays the same.
+    del other["b"]
+    other.append("x-new", "5")
+    assert "x-new" in h
+    assert h.getlist("x-new") == ["5"]
+    assert "b" not in h
+    # A duplicate added while the size stays the same.
+    del other["x-0"]
+    other.append("a", "6")
+    assert h.getlist("a") == ["4", "6"]
+
+
+def test_mutable_headers_raw_list_is_not_indexed():
+    h = MutableHeaders({f"x-{i}": "" for i in range(8)})
+    assert "x-0" in h
+    assert "x-0" in h
+    raw = h.raw
+    raw.append((b"a", b"1"))
+    del raw[0]
+    assert h["a"] == "1"
+    assert "x-0" not in h
+    assert h.getlist("x-1") == [""]
+
+
+def test_headers_index_misses_check_shared_list():
+    raw = [(f"h{i}".encode(), b"v") for i in range(10)]
+    h = Headers(raw=raw)
+    assert "h5" in h
+    assert "h5" in h
+    m = MutableHeaders(raw=raw)
+    del m["h1"]
+    m.append("x-new", "1")
+    assert "x-new" in h
+    assert "h1" not in h
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [
+        URL("https://example.org/"),
+        Headers(),
+        MutableHeaders(),
+        QueryParams("a=1"),
+        MultiDict(),
+        FormData(),
+        UploadFile(io.BytesIO()),
+        State(),
+    ],
+)
+def test_datastructures_have_no_instance_dict(instance):
+    assert not hasattr(instance, "__dict__")
+
+
 def test_url_blank_params():
     q = QueryParams("a=123&abc&def&b=456")
     assert "a" in q
@@ -289,6 +441,42 @@ def test_queryparams():
     assert QueryParams(q) == q
 
 
+@pytest.mark.parametrize("query_string", ["a=1&a=2&b=3", b"a=1&a=2&b=3"])
+def test_queryparams_lookups_before_parsing(query_string):
+    q = QueryParams(query_string)
+    assert q["a"] == "2"
+    assert q.getlist("a") == ["1", "2"]
+    assert "b" in q
+    assert "c" not in q
+    with pytest.raises(KeyError):
+        q["c"]
+    with pytest.raises(AttributeError):
+        q.missing
+    assert q._query_string is not None
+
+    assert len(q) == 2
+    assert q._query_string is None
+    assert q["a"] == "2"
+    assert "b" in q
+
+
+@pytest.mark.parametrize("query_string", ["a=1", b"a=1"])
+def test_queryparams_from_query_string_and_kwargs(query_string):
+    q = QueryParams(query_string, b="2")
+    assert q.multi_items() == [("a", "1"), ("b", "2")]
+
+
+@pytest.mark.parametrize("key", ["a b", "a+b", "é", "", "c", "d", "e&"])
+def test_queryparams_lookups_match_parsed(key):
+    query_string = "a+b=1&a%20b=2&%C3%A9=%C3%A9&=4&&c&d=&e%26=5&c=a%2Bb+c"
+    lazy = QueryParams(query_string)
+    parsed = QueryParams(query_string)
+    parsed.multi_items()
+    assert lazy.getlist(key) == parsed.getlist(key)
+    assert (key in lazy) == (key in parsed)
+    assert lazy.get(key) == parsed.get(key)
+
+
 @pytest.mark.anyio
 async def test_upload_file_file_input():
     """Test passing file/stream into the UploadFile constructor"""
@@ -0,0 +1,119 @@
+import json
+import math
+import typing
+
+import pytest
+
+from starlette import json_codecs
+from starlette.applications import Starlette
+from starlette.json_codecs import (
+    JSONCodec,
+    ORJSONCodec,
+    StdlibJSONCodec,
+    current_json_codec,
+    default_json_codec,
+    get_json_codec,
+    register_json_codec,
+)
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class RecordingCodec(JSONCodec):
+    def __init__(self) -> None:
+        self.calls: typing.List[str] = []
+
+    def dumps(self, content: typing.Any) -> bytes:
+        self.calls.append("dumps")
+        return json.dumps({"recorded": content}).encode("utf-8")
+
+    def loads(self, data: bytes) -> typing.Any:
+        self.calls.append("loads")
+        return json.loads(data)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        {"hello": "world"},
+        [1, 2.5, None, True, "ünïcode ✓", {"nested": ["a", "b"]}],
+        "a string",
+        1e16,
+    ],
+)
+def test_stdlib_codec(content):
+    codec = StdlibJSONCodec()
+    expected = json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert codec.dumps(content) == expected
+    assert codec.loads(expected) == content
+
+
+def test_stdlib_codec_rejects_nan():
+    with pytest.raises(ValueError):
+        StdlibJSONCodec().dumps(math.nan)
+
+
+def test_orjson_codec():
+    codec = ORJSONCodec()
+    content = {"hello": "wörld", "items": [1, 2.5, None]}
+    assert codec.dumps(content) == StdlibJSONCodec().dumps(content)
+    assert codec.loads(codec.dumps(content)) == content
+
+
+def test_get_json_codec(monkeypatch):
+    monkeypatch.setattr(json_codecs, "_registry", dict(json_codecs._registry))
+    codec = RecordingCodec()
+    assert get_json_codec(codec) is codec
+    assert get_json_codec("json") is default_json_codec
+    assert isinstance(get_json_codec("orjson"), ORJSONCodec)
+    with pytest.raises(AssertionError):
+        get_json_codec("recording")
+
+    register_json_codec("recording", codec)
+    assert get_json_codec("recording") is codec
+
+
+def test_json_response_codec():
+    class ORJSONResponse(JSONResponse):
+        json_codec = "orjson"
+
+    response = ORJSONResponse({"nan": math.nan})
+    assert response.body == b'{"nan":null}'
+    with pytest.raises(ValueError):
+        JSONResponse({"nan": math.nan})
+
+
+def test_app_json_codec(test_client_factory):
+    codec = RecordingCodec()
+
+    async def echo(request: Request) -> JSONResponse:
+        return JSONResponse(await request.json())
+
+    def sync_endpoint(request: Request) -> JSONResponse:
+        return JSONResponse("sync")
+
+    app = Starlette(
+        routes=[
+            Route("/echo", echo, methods=["POST"]),
+            Route("/sync", sync_endpoint),
+        ],
+        json_codec=codec,
+    )
+    client = test_client_factory(app)
+
+    response = client.post("/echo", json={"a": 1})
+    assert response.json() == {"recorded": {"a": 1}}
+    assert codec.calls == ["loads", "dumps"]
+
+    response = client.get("/sync")
+    assert response.json() == {"recorded": "sync"}
+    assert current_json_codec() is default_json_codec
+
+
+def test_app_json_codec_by_name():
+    app = Starlette(json_codec="orjson")
+    assert isinstance(app.json_codec, ORJSONCodec)
+    assert Starlette().json_codec is None
@@ -5,7 +5,7 @@ import anyio
 import pytest
 
 from starlette.datastructures import Address, State
-from starlette.requests import ClientDisconnect, Request
+from starlette.requests import ClientDisconnect, Request, cookie_parser, find_cookie
 from starlette.responses import JSONResponse, PlainTextResponse, Response
 from starlette.types import Message, Scope
 
@@ -25,6 +25,29 @@ def test_request_url(test_client_factory):
     assert response.json() == {"method": "GET", "url": "https://example.org:123/"}
 
 
+def test_request_base_url():
+    scope = {
+        "type": "http",
+        "scheme": "https",
+        "server": ["10.0.0.1", 8000],
+        "path": "/app/users",
+        "root_path": "/app",
+        "headers": [(b"host", b"example.org")],
+    }
+    request = Request(scope)
+    assert request.base_url == "https://example.org/app/"
+    # Requests to the same application root share their base URL.
+    assert Request(dict(scope)).base_url is request.base_url
+
+    mounted = Request({**scope, "root_path": "/app/mount", "app_root_path": "/app"})
+    assert mounted.base_url is request.base_url
+
+    request = Request({**scope, "headers": []})
+    assert request.base_url == "https://10.0.0.1:8000/app/"
+    request = Request({**scope, "headers": [], "server": None, "root_path": ""})
+    assert request.base_url == "/"
+
+
 def test_request_query_params(test_client_factory):
     async def app(scope, receive, send):
         request = Request(scope, receive)
@@ -188,6 +211,25 @@ def test_request_json(test_client_factory):
     assert response.json() == {"json": {"a": "123"}}
 
 
+def test_request_json_null(test_client_factory):
+    async def app(scope, receive, send):
+        request = Request(scope, receive)
+        first = await request.json()
+        second = await request.json()
+        response = JSONResponse({"json": [first, second]})
+        await response(scope, receive, send)
+
+    client = test_client_factory(app)
+    response = client.post("/", content=b"null")
+    assert response.json() == {"json": [None, None]}
+
+
+def test_request_has_no_instance_dict():
+    request = Request({"type": "http", "headers": [], "query_string": b""})
+    with pytest.raises(AttributeError):
+        request.extra = True  # type: ignore[attr-defined]
+
+
 def test_request_scope_interface():
     """
     A Request can be instantiated with a scope, and presents a `Mapping`
@@ -433,6 +475,40 @@ def test_cookies_invalid(set_cookie, expected, test_client_factory):
     assert result["cookies"] == expected
 
 
+@pytest.mark.parametrize(
+    "cookie_string",
+    [
+        "chips=ahoy; vienna=finger",
+        'keebler="E=mc2; L=\\"Loves\\"; fudge=\\012;"',
+        "keebler=E=mc2; E=mc3",
+        "a=b; h=i; a=c",
+        "abc=def; unnamed; django_language=en",
+        "a b c=d e = f; gh=i; c=j",
+        "  =  b  ;  ;  =  ;   c  =  ;  ",
+        "ba=1; a",
+    ],
+)
+def test_find_cookie(cookie_string):
+    expected = cookie_parser(cookie_string)
+    for name in [*expected, "a", "b", "c", "E", "mc2", "missing", "x=y", ""]:
+        assert find_cookie(cookie_string, name) == expected.get(name)
+
+
+def test_request_get_cookie():
+    scope = {"type": "http", "headers": [(b"cookie", b'a=1; b="2"; a=3')]}
+    request = Request(scope)
+    assert request.get_cookie("a") == "3"
+    assert request.get_cookie("b") == "2"
+    assert request.get_cookie("c") is None
+    assert request.get_cookie("c", "default") == "default"
+    assert request.cookies == {"a": "3", "b": "2"}
+    assert request.get_cookie("a") == "3"
+    assert request.get_cookie("c", "default") == "default"
+
+    request = Request({"type": "http", "headers": []})
+    assert request.get_cookie("a", "default") == "default"
+
+
 def test_chunked_encoding(test_client_factory):
     async def app(scope, receive, send):
         request = Request(scope, receive)
@@ -1,6 +1,9 @@
 import datetime as dt
+import json
 import os
+import threading
 import time
+import typing
 from http.cookies import SimpleCookie
 from pathlib import Path
 
@@ -10,12 +13,14 @@ import pytest
 from starlette import status
 from starlette.background import BackgroundTask
 from starlette.datastructures import Headers
+from starlette.json_codecs import JSONCodec
 from starlette.requests import Request
 from starlette.responses import (
     FileResponse,
     JSONResponse,
     RedirectResponse,
     Response,
+    StreamingJSONResponse,
     StreamingResponse,
 )
 from starlette.testclient import TestClient
@@ -180,6 +185,155 @@ def test_sync_streaming_response(test_client_factory):
     assert response.text == "1, 2, 3, 4, 5"
 
 
+async def receive_nothing() -> Message:
+    await anyio.sleep_forever()
+    raise AssertionError()  # pragma: no cover
+
+
+@pytest.mark.anyio
+async def test_streaming_response_buffer_size():
+    bodies: typing.List[bytes] = []
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    async def chunks():
+        for _ in range(4):
+            yield "ab"
+        yield b""  # Flushes the buffer.
+        yield b"c"
+        yield b"defgh"
+        yield b"i"
+
+    response = StreamingResponse(chunks(), buffer_size=5)
+    await response({"type": "http"}, receive_nothing, send)
+    assert bodies == [b"ababab", b"ab", b"cdefgh", b"i", b""]
+
+
+@pytest.mark.anyio
+async def test_streaming_response_buffer_size_sync_content():
+    bodies: typing.List[bytes] = []
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+
+    def chunks():
+        yield from ["ab"] * 4
+        yield b""
+        yield from [b"c", b"defgh", b"i"]
+
+    response = StreamingResponse(chunks(), buffer_size=5)
+    await response({"type": "http"}, receive_nothing, send)
+    assert bodies == [b"ababab", b"ab", b"cdefgh", b"i", b""]
+
+    bodies.clear()
+    response = StreamingResponse(chunks(), buffer_timeout=60)
+    await response({"type": "http"}, receive_nothing, send)
+    assert bodies == [b"abababab", b"cdefghi", b""]
+
+
+@pytest.mark.anyio
+async def test_streaming_response_buffer_timeout_sync_content():
+    bodies: typing.List[bytes] = []
+    flushed = threading.Event()
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+            flushed.set()
+
+    def chunks():
+        yield b"a"
+        # Blocks the worker thread until the timed flush has sent b"a".
+        assert flushed.wait(5)
+        yield b"b"
+
+    response = StreamingResponse(chunks(), buffer_timeout=0.01)
+    with anyio.fail_after(5):
+        await response({"type": "http"}, receive_nothing, send)
+    assert bodies == [b"a", b"b", b""]
+
+
+@pytest.mark.anyio
+async def test_streaming_response_buffer_timeout():
+    bodies: typing.List[bytes] = []
+    flushed = anyio.Event()
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            bodies.append(message["body"])
+            flushed.set()
+
+    async def chunks():
+        yield b"a"
+        yield b"b"
+        # Only a timed flush can send the buffered chunks while waiting here.
+        await flushed.wait()
+        yield b"c"
+
+    response = StreamingResponse(chunks(), buffer_size=1024, buffer_timeout=0.01)
+    with anyio.fail_after(5):
+        await response({"type": "http"}, receive_nothing, send)
+    assert bodies == [b"ab", b"c", b""]
+
+
+@pytest.mark.parametrize("count", [0, 1, 5, 6])
+@pytest.mark.parametrize("asynchronous", [True, False])
+def test_streaming_json_response(count, asynchronous, test_client_factory):
+    items = [{"id": i, "name": f"ïtem {i}"} for i in range(count)]
+
+    async def async_items():
+        for item in items:
+            yield item
+
+    async def app(scope, receive, send):
+        content = async_items() if asynchronous else iter(items)
+        response = StreamingJSONResponse(content, batch_size=5)
+        await response(scope, receive, send)
+
+    client = test_client_factory(app)
+    response = client.get("/")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == items
+    assert response.content == JSONResponse(items).body
+
+
+def test_streaming_json_response_ndjson(test_client_factory):
+    items = [{"id": i} for i in range(3)]
+
+    async def app(scope, receive, send):
+        response = StreamingJSONResponse(items, ndjson=True)
+        await response(scope, receive, send)
+
+    client = test_client_factory(app)
+    response = client.get("/")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text == '{"id":0}\n{"id":1}\n{"id":2}\n'
+
+
+@pytest.mark.anyio
+async def test_streaming_json_response_batches():
+    sent: typing.List[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    class IndentedCodec(JSONCodec):
+        def dumps(self, content):
+            return json.dumps(content, indent=2).encode() + b"\n"
+
+    class IndentedResponse(StreamingJSONResponse):
+        json_codec = IndentedCodec()
+
+    response = IndentedResponse(range(7), batch_size=3)
+    await response({"type": "http"}, receive_nothing, send)
+    bodies = [message["body"] for message in sent[1:]]
+    assert len(bodies) == 5
+    assert json.loads(b"".join(bodies)) == list(range(7))
+
+
 def test_response_headers(test_client_factory):
     async def app(scope, receive, send):
         headers = {"x-header-1": "123", "x-header-2": "456"}
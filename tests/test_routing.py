@@ -1,17 +1,33 @@
 import contextlib
 import functools
 import json
+import logging
+import re
 import typing
 import uuid
+from unittest import mock
 
 import pytest
 
+from starlette import routing
 from starlette.applications import Starlette
+from starlette.datastructures import URLPath
 from starlette.exceptions import HTTPException
 from starlette.middleware import Middleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse, PlainTextResponse, Response
-from starlette.routing import Host, Mount, NoMatchFound, Route, Router, WebSocketRoute
+from starlette.routing import (
+    BaseRoute,
+    Host,
+    Match,
+    Mount,
+    NoMatchFound,
+    Route,
+    Router,
+    WebSocketRoute,
+    compile_path,
+    replace_params,
+)
 from starlette.testclient import TestClient
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from starlette.websockets import WebSocket, WebSocketDisconnect
@@ -1310,3 +1326,521 @@ def test_paths_with_root_path(test_client_factory: typing.Callable[..., TestClie
         "path": "/root/sub/path",
         "root_path": "/root/sub",
     }
+
+
+@pytest.mark.parametrize("dispatch", ["prefix-tree", "regex-union", "linear"])
+def test_router_dispatch_preserves_declaration_order(
+    test_client_factory: typing.Callable[..., TestClient], dispatch: str
+) -> None:
+    def named(name: str) -> typing.Callable[[Request], PlainTextResponse]:
+        def endpoint(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(name)
+
+        return endpoint
+
+    app = Router(
+        routes=[
+            Route("/users/{username}", named("param"), methods=["POST"]),
+            Route("/users/me", named("static")),
+            Mount("/users/me", routes=[Route("/other", named("mounted"))]),
+            Host("api.example.org", app=PlainTextResponse("host")),
+            Route("/users/{username}", named("param-get")),
+            WebSocketRoute("/users/{username}", endpoint=partial_ws_endpoint),
+        ],
+        dispatch=dispatch,
+    )
+    client = test_client_factory(app)
+
+    assert client.post("/users/me").text == "param"
+    assert client.get("/users/me").text == "static"
+    assert client.get("/users/me/other").text == "mounted"
+    assert client.get("/users/tomchristie").text == "param-get"
+    response = client.delete("/users/me")
+    assert response.status_code == 405
+    assert response.headers["allow"] == "POST"
+    host_client = test_client_factory(app, base_url="https://api.example.org")
+    assert host_client.get("/users/tomchristie").text == "host"
+    assert host_client.post("/users/me").text == "param"
+    with client.websocket_connect("/users/tomchristie") as session:
+        assert session.receive_json() == {"url": "ws://testserver/users/tomchristie"}
+
+
+def test_router_dispatch_index_tracks_route_changes(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    app = Router(routes=[Route("/", endpoint=homepage)])
+    client = test_client_factory(app)
+    assert client.get("/users").status_code == 404
+
+    app.routes.append(Route("/users", endpoint=users))
+    assert client.get("/users").text == "All users"
+
+    app.routes[1] = Route("/users", endpoint=func_homepage)
+    assert client.get("/users").text == "Hello, world!"
+
+    del app.routes[1]
+    assert client.get("/users").status_code == 404
+
+    app.routes = [Route("/users", endpoint=users)]
+    assert client.get("/users").text == "All users"
+
+
+def test_router_routes_reassigned_before_changes(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    app = Router(routes=[Route("/", endpoint=homepage)], route_cache_size=8)
+    client = test_client_factory(app)
+    assert client.get("/").text == "Hello, world"
+
+    app.routes = [Route("/users", endpoint=users)]
+    assert client.get("/users").text == "All users"
+    assert client.get("/").status_code == 404
+
+
+def test_route_list_modifications_clear_indexes(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    first = Route("/first", endpoint=homepage, name="first")
+    second = Route("/second", endpoint=homepage, name="second")
+    app = Router(routes=[first])
+    client = test_client_factory(app)
+
+    def paths() -> typing.List[int]:
+        return [
+            client.get("/first").status_code,
+            client.get("/second").status_code,
+        ]
+
+    app.routes.insert(0, second)
+    assert paths() == [200, 200]
+    app.routes.reverse()
+    app.routes.sort(key=lambda route: typing.cast(Route, route).path, reverse=True)
+    assert app.url_path_for("second") == "/second"
+    app.routes.remove(second)
+    assert paths() == [200, 404]
+    app.routes.extend([second])
+    app.routes *= 1
+    app.routes += []
+    assert paths() == [200, 200]
+    assert app.routes.pop() is second
+    del app.routes[0]
+    assert paths() == [404, 404]
+    app.routes.append(first)
+    app.routes[0] = second
+    assert paths() == [404, 200]
+    app.routes.clear()
+    assert paths() == [404, 404]
+    with pytest.raises(NoMatchFound):
+        app.url_path_for("second")
+
+
+@pytest.mark.parametrize("dispatch", ["prefix-tree", "regex-union", "linear"])
+def test_router_static_routes(
+    test_client_factory: typing.Callable[..., TestClient], dispatch: str
+) -> None:
+    app = Router(
+        routes=[
+            Route("/health.json", endpoint=homepage, methods=["GET"]),
+            Route("/{name}.json", endpoint=user_me, methods=["GET"]),
+            Route("/health.json", endpoint=contact, methods=["POST"]),
+        ],
+        dispatch=dispatch,
+    )
+    client = test_client_factory(app)
+
+    assert client.get("/health.json").text == "Hello, world"
+    assert client.post("/health.json").text == "Hello, POST!"
+    assert client.get("/healthxjson").status_code == 404
+    assert client.get("/other.json").text == "User fixed me"
+    response = client.put("/health.json")
+    assert response.status_code == 405
+    assert set(response.headers["allow"].split(", ")) == {"GET", "HEAD"}
+
+
+def test_regex_union_resumes_after_partial_match(
+    test_client_factory: typing.Callable[..., TestClient],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    app = Router(
+        routes=[
+            Route("/items", endpoint=homepage, methods=["GET"]),
+            Host("api.example.org", app=PlainTextResponse("host")),
+            Route("/items/{id}", endpoint=user_me),
+            Route("/items", endpoint=contact, methods=["POST"]),
+        ],
+        dispatch="regex-union",
+    )
+    client = test_client_factory(app)
+    assert client.get("/items").text == "Hello, world"
+
+    # Matching only compiles an alternation per segment, when the index is built.
+    compile_union = mock.Mock(wraps=routing._compile_union)
+    monkeypatch.setattr(routing, "_compile_union", compile_union)
+    assert client.post("/items").text == "Hello, POST!"
+    assert client.put("/items").status_code == 405
+    assert client.get("/items/1").text == "User fixed me"
+    compile_union.assert_not_called()
+
+
+def test_router_route_cache(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    app = Router(
+        routes=[
+            Host("api.example.org", app=PlainTextResponse("host")),
+            Route("/", endpoint=homepage),
+            Route("/users/{username}", endpoint=user),
+        ],
+        route_cache_size=2,
+    )
+    client = test_client_factory(app)
+    host_client = test_client_factory(app, base_url="https://api.example.org")
+    assert Router().route_cache_info() is None
+
+    assert client.get("/users/tomchristie").text == "User tomchristie"
+    assert client.get("/users/tomchristie").text == "User tomchristie"
+    assert host_client.get("/users/tomchristie").text == "host"
+    assert app.route_cache_info() == (1, 2, 2, 2)
+
+    assert client.get("/").text == "Hello, world"
+    assert client.get("/users/tomchristie").text == "User tomchristie"
+    assert app.route_cache_info() == (1, 4, 2, 2)
+
+    assert client.post("/").status_code == 405
+    assert client.post("/").status_code == 405
+    assert client.get("/missing").status_code == 404
+    assert app.route_cache_info() == (2, 6, 2, 2)
+
+    app.routes.insert(0, Route("/", endpoint=contact, methods=["POST"]))
+    assert app.route_cache_info() == (2, 6, 2, 2)
+    assert client.post("/").text == "Hello, POST!"
+    assert app.route_cache_info() == (2, 7, 2, 1)
+
+
+def test_url_path_for_tracks_route_changes() -> None:
+    mount = Mount(
+        "/users",
+        name="users",
+        routes=[Route("/{username}", endpoint=user, name="user")],
+    )
+    app = Router(routes=[Route("/", endpoint=homepage), mount])
+    assert app.url_path_for("users:user", username="tom") == "/users/tom"
+    with pytest.raises(NoMatchFound):
+        app.url_path_for("users:list")
+
+    app.routes.insert(0, Route("/people/{username}", endpoint=user, name="users:user"))
+    assert app.url_path_for("users:user", username="tom") == "/people/tom"
+
+    mount.routes.append(Route("/", endpoint=users, name="list"))
+    assert app.url_path_for("users:list") == "/users/"
+
+
+def test_url_path_for_skips_failing_children() -> None:
+    class CustomRoute(BaseRoute):
+        def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
+            return Match.NONE, {}  # pragma: no cover
+
+        def url_path_for(self, name: str, /, **path_params: typing.Any) -> URLPath:
+            if name != "custom":
+                raise NoMatchFound(name, path_params)
+            return URLPath("/custom")
+
+    app = Router(
+        routes=[
+            CustomRoute(),
+            Mount("/a", routes=[Route("/{x}", endpoint=homepage, name="r")]),
+            Host(
+                "{sub}.example.org",
+                app=Router(routes=[Route("/{y}", endpoint=homepage, name="r")]),
+            ),
+            Host("www.example.org", app=ok, name="www"),
+        ]
+    )
+    assert app.url_path_for("custom") == "/custom"
+    assert app.url_path_for("r", x="1") == "/a/1"
+    url = app.url_path_for("r", y="2")
+    assert (url, url.host) == ("/2", "{sub}.example.org")
+    with pytest.raises(NoMatchFound):
+        app.url_path_for("r", z="3")
+    with pytest.raises(NoMatchFound):
+        app.url_path_for("www:r")
+    with pytest.raises(NoMatchFound):
+        WebSocketRoute("/ws", endpoint=ws_helloworld).url_path_for("other")
+
+
+def test_url_path_for_multiple_params() -> None:
+    app = Router(
+        routes=[
+            Route("/files/{name}.{ext}/v{version:int}", endpoint=homepage, name="f"),
+            Mount("/{org}/{repo}", name="repo", routes=[Route("/", endpoint=users)]),
+        ]
+    )
+    assert app.url_path_for("f", name="a", ext="txt", version=2) == "/files/a.txt/v2"
+    assert app.url_path_for("repo", org="encode", repo="starlette", path="/a") == (
+        "/encode/starlette/a"
+    )
+    assert app.url_path_for("repo:users", org="encode", repo="starlette") == (
+        "/encode/starlette/"
+    )
+    with pytest.raises(NoMatchFound):
+        app.url_path_for("f", name="a", ext="txt")
+
+
+def test_replace_params() -> None:
+    path_regex, path_format, convertors = compile_path("/{a}/{b}")
+    path, remaining = replace_params(path_format, convertors, {"b": "1", "c": "2"})
+    assert path == "/{a}/1"
+    assert remaining == {"c": "2"}
+
+
+def test_router_host_dispatch(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    app = Router(
+        routes=[
+            Host("{subdomain}.example.org", app=PlainTextResponse("subdomain")),
+            Host("api.example.com:8000", app=PlainTextResponse("api")),
+            Route("/", endpoint=homepage),
+            Host("www.example.com", app=PlainTextResponse("www")),
+        ]
+    )
+
+    def get(host: str) -> str:
+        client = test_client_factory(app, base_url=f"https://{host}")
+        return client.get("/").text
+
+    assert get("tenant.example.org") == "subdomain"
+    assert get("api.example.com") == "api"
+    assert get("api.example.com:8000") == "api"
+    assert get("www.example.com") == "Hello, world"
+    assert get("other.example.com") == "Hello, world"
+
+
+def test_router_host_dispatch_with_custom_routes() -> None:
+    class AnyRoute(BaseRoute):
+        def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
+            return Match.FULL, {"endpoint": homepage}
+
+        async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+            await PlainTextResponse("any")(scope, receive, send)
+
+    app = Router(
+        routes=[Host("www.example.com", app=PlainTextResponse("www")), AnyRoute()]
+    )
+    client = TestClient(app, base_url="https://www.example.com")
+    assert client.get("/").text == "www"
+    client = TestClient(app, base_url="https://other.example.com")
+    assert client.get("/").text == "any"
+
+    # A scope without a "host" header matches no host pattern.
+    host = Host("{subdomain}.example.org", app=ok)
+    scope = {"type": "http", "path": "/", "headers": []}
+    assert host.matches(scope) == (Match.NONE, {})
+
+
+def test_router_uses_overridden_matches(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    class PrefixRoute(Route):
+        def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
+            if scope["type"] == "http" and scope["path"].startswith(self.path):
+                return Match.FULL, {"endpoint": self.endpoint, "path_params": {}}
+            return Match.NONE, {}
+
+    app = Router(
+        routes=[
+            PrefixRoute("/users", endpoint=users),
+            Route("/users/{username}", endpoint=user),
+            Route("/{username}", endpoint=user),
+        ]
+    )
+    client = test_client_factory(app)
+    assert client.get("/users/tomchristie").text == "All users"
+    assert client.get("/tomchristie").text == "User tomchristie"
+
+
+def test_matches_without_router() -> None:
+    def scope(path: str, host: typing.Optional[bytes] = None) -> Scope:
+        headers = [] if host is None else [(b"host", host)]
+        return {"type": "http", "method": "GET", "path": path, "headers": headers}
+
+    mount = Mount("/static", app=ok)
+    assert mount.matches(scope("/static/css/site.css"))[0] == Match.FULL
+    assert mount.matches(scope("/other")) == (Match.NONE, {})
+    assert mount.matches({"type": "lifespan"}) == (Match.NONE, {})
+
+    host = Host("{sub}.example.org", app=ok)
+    match, child_scope = host.matches(scope("/", b"api.example.org:8000"))
+    assert match == Match.FULL
+    assert child_scope["path_params"] == {"sub": "api"}
+
+
+def test_router_redirect_slashes(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    class CustomRoute(BaseRoute):
+        def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
+            if scope["path"] == "/custom/":
+                return Match.FULL, {}
+            return Match.NONE, {}
+
+    app = Router(
+        routes=[
+            Route("/static", endpoint=homepage),
+            Route("/users/{username}/", endpoint=user),
+            Route("/posts", endpoint=contact, methods=["POST"]),
+            CustomRoute(),
+        ]
+    )
+    client = test_client_factory(app, follow_redirects=False)
+
+    response = client.get("/static/")
+    assert response.status_code == 307
+    assert response.headers["location"] == "http://testserver/static"
+    response = client.get("/users/tomchristie?page=2")
+    assert response.status_code == 307
+    assert response.headers["location"] == "http://testserver/users/tomchristie/?page=2"
+    response = client.get("/posts/")
+    assert response.status_code == 307
+    assert response.headers["location"] == "http://testserver/posts"
+    response = client.get("/custom")
+    assert response.status_code == 307
+    assert response.headers["location"] == "http://testserver/custom/"
+    assert client.get("/missing").status_code == 404
+    assert client.get("/missing/").status_code == 404
+
+
+def test_router_compile_freezes_routes() -> None:
+    inner = Router(routes=[Route("/", endpoint=users)])
+    app = Router(routes=[Route("/", endpoint=homepage), Mount("/users", app=inner)])
+    app.compile()
+
+    with pytest.raises(RuntimeError, match="cannot be modified"):
+        app.routes.append(Route("/other", endpoint=homepage))
+    with pytest.raises(RuntimeError, match="cannot be modified"):
+        inner.add_route("/other", endpoint=homepage)
+    with pytest.raises(RuntimeError, match="cannot be modified"):
+        app.routes = []
+    assert len(app.routes) == 2
+
+
+@pytest.mark.parametrize(
+    "routes, problem",
+    [
+        (
+            [Route("/{username}", endpoint=user), Route("/me", endpoint=user_me)],
+            "Route(path='/me', name='user_me', methods=['GET', 'HEAD']) is shadowed "
+            "by Route(path='/{username}', name='user', methods=['GET', 'HEAD']).",
+        ),
+        (
+            [Mount("", app=ok), Route("/me", endpoint=user_me)],
+            "Route(path='/me', name='user_me', methods=['GET', 'HEAD']) is shadowed",
+        ),
+        (
+            [Mount("/static", app=ok), Mount("/static/css", app=ok)],
+            "Mount(path='/static/css', name='', app=<starlette.responses",
+        ),
+        (
+            [
+                WebSocketRoute("/ws", endpoint=ws_helloworld),
+                WebSocketRoute("/ws", ws_helloworld),
+            ],
+            "WebSocketRoute(path='/ws', name='ws_helloworld') is shadowed",
+        ),
+        (
+            [Mount("/api", app=ok), Route("/api/users/{id}", endpoint=user)],
+            "Route(path='/api/users/{id}', name='user', methods=['GET', 'HEAD']) is "
+            "shadowed by Mount(path='/api', name='', app=<starlette.responses",
+        ),
+        (
+            [Mount("/api", app=ok), Mount("/api/{version}", app=ok)],
+            "Mount(path='/api/{version}', name='', app=<starlette.responses",
+        ),
+        (
+            [
+                Route("/{rest:path}", endpoint=user),
+                Route("/items/{id}", endpoint=user_me),
+            ],
+            "Route(path='/items/{id}', name='user_me', methods=['GET', 'HEAD']) is "
+            "shadowed by Route(path='/{rest:path}', name='user', "
+            "methods=['GET', 'HEAD']).",
+        ),
+        (
+            [
+                WebSocketRoute("/{tenant}/{rest:path}", endpoint=ws_helloworld),
+                WebSocketRoute("/acme/{room}", endpoint=ws_helloworld),
+            ],
+            "WebSocketRoute(path='/acme/{room}', name='ws_helloworld') is shadowed",
+        ),
+        (
+            [Route("/a", endpoint=user_me), Route("/b", endpoint=user_me)],
+            "Route name 'user_me' is used for both '/a' and '/b'",
+        ),
+    ],
+)
+def test_router_compile_reports_problems(
+    routes: typing.List[BaseRoute], problem: str
+) -> None:
+    with pytest.raises(ValueError, match=re.escape(problem)):
+        Router(routes=routes).compile()
+
+
+def test_router_compile_accepts_valid_routes() -> None:
+    Router(
+        routes=[
+            Route("/me", endpoint=user_me),
+            Route("/{username}", endpoint=user),
+            Route("/me", endpoint=contact, methods=["POST"]),
+            Route("/", endpoint=homepage, methods=["GET"]),
+            Route("/", endpoint=homepage, methods=["POST"]),
+            Mount("/static", app=ok),
+            Mount("/static-files", app=ok),
+            Route("/files/{rest:path}", endpoint=user, methods=["GET"]),
+            Route("/files/{id}", endpoint=contact, methods=["POST"]),
+            WebSocketRoute("/files/{id}", endpoint=ws_helloworld),
+            Route("/files{suffix}", endpoint=user),
+            Route("/{rest:path}.json", endpoint=user, name="json"),
+            Route("/items/{id}", endpoint=user, name="item"),
+        ]
+    ).compile()
+
+
+def test_freeze_routes_on_startup(
+    test_client_factory: typing.Callable[..., TestClient],
+) -> None:
+    app = Starlette(
+        routes=[
+            Route("/{username}", endpoint=user),
+            Route("/me", endpoint=user_me),
+        ],
+        freeze_routes=True,
+    )
+    with pytest.raises(ValueError, match="Invalid route table"):
+        with test_client_factory(app):
+            pass  # pragma: no cover
+
+    app = Starlette(routes=[Route("/", endpoint=homepage)], freeze_routes=True)
+    with test_client_factory(app) as client:
+        assert client.get("/").text == "Hello, world"
+        with pytest.raises(RuntimeError):
+            app.add_route("/other", homepage)
+
+
+def test_router_compile_logs_index_stats(caplog: pytest.LogCaptureFixture) -> None:
+    class CustomRoute(BaseRoute):
+        def matches(self, scope: Scope) -> typing.Tuple[Match, Scope]:
+            return Match.NONE, {}  # pragma: no cover
+
+    app = Router(
+        routes=[
+            CustomRoute(),
+            Route("/me", endpoint=user_me),
+            Route("/{name}/", endpoint=user),
+            Mount("/static", app=ok),
+        ],
+        dispatch="regex-union",
+    )
+    with caplog.at_level(logging.DEBUG, logger="starlette.routing"):
+        app.compile()
+    assert "Compiled 4 routes" in caplog.text
+    assert "alternatives" in caplog.text